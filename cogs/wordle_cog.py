@@ -2,25 +2,33 @@ import discord
 import asyncio
 import os
 from dotenv import load_dotenv
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, Optional
+from datetime import datetime, date
 from discord.ui import View, Button, Select, Modal, TextInput
 from discord import app_commands
 from discord.ext import commands
 from models.game_history import GameHistory
+from models.analytics import GameAnalytics
 from models.server_config import ServerConfig
 from models.user_settings import UserSettings
 from models.daily_challenge import DailyChallenge
+from models.daily_archive import DailyArchive
+from models.persistence import WriteBehindPersister
+from utils.user_directory import UserDirectory
 from views.leaderboard_views import EnhancedLeaderboardView
 from views.history_views import HistoryView, HistorySelectionView
 from views.game_views import GameView, EndGameView, MainMenu
 from views.settings_views import SettingsView, AnonPasswordModal
 from modals.modals import GuessModal, SearchModal
-from views.stats_views import StatsView, SearchIDModal
-from views.daily_views import DailyChallengeView
+from views.stats_views import StatsView, SearchIDModal, create_game_id_embed, create_stats_embed, create_server_stats_embed
+from views.daily_views import DailyChallengeView, create_daily_leaderboard_embed
 from models.achievement_system import AchievementSystem
 from models.daily_challenge import DailyChallenge
 from models.wordle_game import WordleGame
+from models.feedback_matrix import get_feedback_matrix
+from models.solver import SolverHints
+from utils.word_bank import get_word_bank
+from utils.allowed_words import refresh_allowed_words
 
 # Variables
 load_dotenv()
@@ -36,12 +44,56 @@ class WordleCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.games: Dict[int, WordleGame] = {}
-        self.history = GameHistory()
-        self.config = ServerConfig()
         self.settings = UserSettings()
+        self.history = GameHistory(self.settings)
+        self.config = ServerConfig()
         self.persistent_views_added = False
         self.achievement_system = AchievementSystem(self)
-        self.daily_challenge = DailyChallenge()
+        self.daily_archive = DailyArchive()
+        self.daily_challenge = DailyChallenge(self.daily_archive)
+        self.users = UserDirectory(bot)
+        self.analytics = GameAnalytics(self.history)
+        self.word_bank = get_word_bank()
+        # Neu geladene Listen bekommen ihre Muster-Matrix im Reload-Thread, bevor Spiele sie sehen
+        self.word_bank.preparers.append(get_feedback_matrix)
+        self.word_bank.listeners.append(self.on_word_lists_reloaded)
+        self.solver = SolverHints()
+        # Laufende Nachanalysen, damit die Tasks nicht vorzeitig eingesammelt werden
+        self.analysis_tasks = set()
+        
+        # Alle Stores werden gebündelt im Hintergrund gespeichert
+        self.persister = WriteBehindPersister()
+        # Das Archiv vor der Daily Challenge, damit ein abgelaufener Tag nie nur gelöscht auf der Platte steht
+        self.persister.register(self.history.storage, self.settings, self.config, self.daily_archive,
+                                self.daily_challenge)
+
+    async def cog_load(self):
+        # Muster-Matrizen aller Listen im Executor kompilieren bzw. per Memory-Map öffnen, nicht beim ersten Rateversuch
+        await asyncio.get_running_loop().run_in_executor(None, self.word_bank.prepare)
+        self.persister.start()
+        self.word_bank.start()
+        # Wörterbuch im Hintergrund laden, nicht beim ersten Rateversuch
+        self.word_cache_task = asyncio.create_task(self.refresh_word_caches())
+        # Analyse-Spalten im Executor aufbauen, nicht beim ersten /serverstats
+        self.analytics.start()
+
+    async def cog_unload(self):
+        await self.persister.stop()
+        self.word_bank.stop()
+        self.word_bank.preparers.remove(get_feedback_matrix)
+        self.word_bank.listeners.remove(self.on_word_lists_reloaded)
+        self.solver.shutdown()
+
+    def on_word_lists_reloaded(self, changed: list):
+        self.word_cache_task = asyncio.create_task(self.refresh_word_caches())
+
+    async def refresh_word_caches(self):
+        # Wörterbuch und Solver-Matrizen enthalten die Wörter aller Listen
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, refresh_allowed_words)
+        except Exception as e:
+            print(f"Fehler beim Laden des Wörterbuchs: {e}")
+        self.solver.invalidate()
 
     async def add_persistent_views(self):
         if not self.persistent_views_added:
@@ -122,7 +174,8 @@ class WordleCog(commands.Cog):
             await interaction.response.send_message("❌ Du hast bereits ein aktives Spiel!", ephemeral=True)
             return
         
-        self.games[interaction.user.id] = WordleGame(interaction.user.id)
+        word_list = self.word_bank.get(self.config.get_word_list(interaction.guild_id))
+        self.games[interaction.user.id] = WordleGame(interaction.user.id, word_list)
         view = GameView(self, interaction.user.id)
         await interaction.response.send_message(embed=self.create_game_embed(interaction.user.id), view=view)
 
@@ -228,7 +281,7 @@ class WordleCog(commands.Cog):
         )
 
         if is_daily:
-            daily_word = self.daily_challenge.get_daily_word()
+            daily_word = self.get_daily_word(interaction.guild_id)
             if guess.lower() != daily_word:
                 await interaction.response.send_message("❌ Falsches Wort für die Daily Challenge!", ephemeral=True)
             return
@@ -256,6 +309,32 @@ class WordleCog(commands.Cog):
         view = GameView(self, interaction.user.id)
         await interaction.response.edit_message(embed=embed, view=view)
     
+    async def handle_solver_hint(self, interaction: discord.Interaction):
+        game = self.games.get(interaction.user.id)
+        if not game or not game.use_solver_hint():
+            await interaction.response.send_message("❌ Keine Tipps mehr verfügbar!", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            suggestions, remaining = await self.solver.suggest(game.attempts, game.word_list.name)
+        except Exception as e:
+            print(f"Solver-Fehler: {str(e)}")
+            game.refund_solver_hint()
+            await interaction.followup.send(
+                "❌ Der Solver ist gerade nicht verfügbar, dein Tipp wurde nicht verbraucht.", ephemeral=True
+            )
+            return
+        lines = [f"**{i}.** `{word.upper()}` – {bits:.2f} Bit" for i, (word, bits) in enumerate(suggestions, 1)]
+        embed = discord.Embed(
+            title="🧠 Solver-Tipp",
+            description="\n".join(lines) or "Kein passendes Wort gefunden",
+            color=discord.Color.purple()
+        )
+        embed.set_footer(text=f"Noch {remaining} mögliche Lösungen · Genutzte Tipps: {game.hints_used}/{MAX_HINTS}")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        await interaction.message.edit(view=GameView(self, interaction.user.id))
+    
     @app_commands.command(name="daily", description="Tägliche Herausforderung")
     async def daily_command(self, interaction: discord.Interaction):
         """Handle Daily Challenge mit speziellem Embed"""
@@ -264,8 +343,7 @@ class WordleCog(commands.Cog):
             return
         
         # Daily-spezifisches Spiel erstellen
-        self.games[interaction.user.id] = WordleGame(interaction.user.id)
-        self.games[interaction.user.id].secret_word = self.daily_challenge.get_daily_word()
+        self.games[interaction.user.id] = self.new_daily_game(interaction.user.id, interaction.guild_id)
         
         view = GameView(self, interaction.user.id)
         await interaction.response.send_message(
@@ -273,6 +351,22 @@ class WordleCog(commands.Cog):
             view=view
         )
 
+    @app_commands.command(name="daily_leaderboard", description="Zeigt das Daily-Challenge-Ranking")
+    @app_commands.describe(datum="Vergangener Tag, z.B. 17.10.2026 (leer für heute)")
+    async def daily_leaderboard_command(self, interaction: discord.Interaction, datum: Optional[str] = None):
+        day = None
+        if datum:
+            try:
+                day = datetime.strptime(datum.strip(), "%d.%m.%Y").date()
+            except ValueError:
+                await interaction.response.send_message("❌ Ungültiges Datum! Format: TT.MM.JJJJ", ephemeral=True)
+                return
+        await self.show_daily_leaderboard(interaction, day)
+
+    async def show_daily_leaderboard(self, interaction: discord.Interaction, day: Optional[date] = None):
+        embed = await create_daily_leaderboard_embed(self, interaction.user.id, day)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     async def handle_end_game(self, interaction: discord.Interaction, won: bool, is_daily: bool = False):
         game = self.games.pop(interaction.user.id, None)
         if not game:
@@ -280,13 +374,21 @@ class WordleCog(commands.Cog):
         
         new_achievements = self.achievement_system.check_achievements(interaction.user.id, game)
         
-        self.history.add_game(interaction.guild_id, interaction.user.id, {
+        game_entry = self.history.add_game(interaction.guild_id, interaction.user.id, {
             "won": won,
             "word": game.secret_word,
             "guesses": game.attempts,
             "hints": game.hints_used,
             "duration": game.get_duration()
         })
+        # Listener wie die Status-Statistiken in main.py werden ohne Dateizugriff informiert
+        self.bot.dispatch("game_finished", interaction.guild_id, interaction.user.id, game_entry)
+        # Nachanalyse läuft im Hintergrund und wird später an den Historien-Eintrag gehängt
+        task = asyncio.create_task(
+            self.attach_analysis(game_entry["id"], game.secret_word, game.attempts, game.word_list.name)
+        )
+        self.analysis_tasks.add(task)
+        task.add_done_callback(self.analysis_tasks.discard)
         
         settings = self.settings.get_settings(interaction.user.id)
         embed = discord.Embed(
@@ -301,6 +403,12 @@ class WordleCog(commands.Cog):
             embed.add_field(name="Spielmodus", value="🎭 Anonymes Spiel", inline=False)
         else:
             embed.add_field(name="Spielmodus", value="🔓 Öffentliches Spiel", inline=False)
+
+        if is_daily or game.secret_word == self.get_daily_word(interaction.guild_id):
+            self.daily_challenge.add_participant(interaction.user.id, len(game.attempts), won, game.get_duration())
+            embed.add_field(name="Daily Challenge",
+                      value=f"🏆 Du bist Platz {self.get_daily_rank(interaction.user.id)}!",
+                      inline=False)
         
         view = EndGameView(self, interaction.user.id)
         await interaction.response.edit_message(embed=embed, view=view)
@@ -310,23 +418,29 @@ class WordleCog(commands.Cog):
         except:
             pass
 
-        if is_daily:
-            self.daily_challenge.add_participant(interaction.user.id, len(game.attempts))
-            embed.add_field(name="Daily Challenge", 
-                      value=f"🏆 Du bist Platz {self.get_daily_rank(interaction.user.id)}!",
-                      inline=False)
-
-        if game.secret_word == self.daily_challenge.get_daily_word():
-            self.daily_challenge.add_participant(interaction.user.id, len(game.attempts))
-
         if new_achievements:
             achievements_text = "\n".join(f"🎉 {a['name']}: {a['description']}" for a in new_achievements)
             embed.add_field(name="Neue Achievements freigeschaltet!", value=achievements_text, inline=False)
     
+    async def attach_analysis(self, game_id: str, secret_word: str, attempts: list, word_list: str):
+        try:
+            analysis = await self.solver.analyze(secret_word, attempts, word_list)
+            self.history.attach_analysis(game_id, analysis)
+        except Exception as e:
+            print(f"Analyse-Fehler: {str(e)}")
+    
+    def get_daily_word(self, guild_id: Optional[int]) -> str:
+        return self.daily_challenge.get_daily_word(guild_id, self.word_bank.get(self.config.get_word_list(guild_id)))
+    
+    def new_daily_game(self, user_id: int, guild_id: Optional[int]) -> WordleGame:
+        guild_list = self.word_bank.get(self.config.get_word_list(guild_id))
+        word_list, word = self.daily_challenge.get_daily(guild_id, guild_list)
+        game = WordleGame(user_id, word_list)
+        game.secret_word = word
+        return game
+    
     def get_daily_rank(self, user_id: int):
-        leaderboard = self.daily_challenge.get_leaderboard()
-        user_str = str(user_id)
-        return next((i+1 for i, (u_id, _) in enumerate(leaderboard) if u_id == user_str), None)
+        return self.daily_challenge.get_rank(user_id)
 
     async def show_stats(self, interaction: discord.Interaction, user: discord.User):
         is_own_stats = interaction.user.id == user.id
@@ -336,32 +450,11 @@ class WordleCog(commands.Cog):
             await interaction.response.send_message("❌ Diese Statistiken sind privat!", ephemeral=True)
             return
     
-        public_games = [g for g in self.history.get_user_games(user.id, "global") if not g.get("anonymous", False)]
-        anon_games = self.history.get_anonymous_games(settings["anon_id"])
-    
-        embed = discord.Embed(
-            title=f"📊 Statistiken",
-            color=discord.Color.gold()
+        embed = create_stats_embed(
+            self.history.get_summary(user_id=user.id),
+            self.history.get_summary(anon_id=settings["anon_id"])
         )
     
-        if public_games or anon_games:
-            # Kopf entfernt - nur noch "Anonyme Spiele" als Unterscheidung
-            if public_games:
-                embed.add_field(name="Öffentliche Spiele", 
-                            value=f"✅ {sum(g['won'] for g in public_games)} Siege\n"
-                                    f"❌ {len(public_games)-sum(g['won'] for g in public_games)} Niederlagen\n"
-                                    f"📊 {sum(g['won'] for g in public_games)/len(public_games)*100:.1f}% Winrate",
-                            inline=True)
-        
-            if anon_games:
-                embed.add_field(name="🎭 Anonyme Spiele", 
-                            value=f"✅ {sum(g['won'] for g in anon_games)} Siege\n"
-                                    f"❌ {len(anon_games)-sum(g['won'] for g in anon_games)} Niederlagen\n"
-                                    f"📊 {sum(g['won'] for g in anon_games)/len(anon_games)*100:.1f}% Winrate",
-                            inline=True)
-        else:
-            embed.description = "📭 Noch keine Spiele gespielt!"
-    
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     async def show_anon_history(self, interaction: discord.Interaction, user: discord.User):
@@ -400,7 +493,7 @@ class WordleCog(commands.Cog):
         # Korrekte Parameter: cog, interaction, guild_id, scope
             view = EnhancedLeaderboardView(self, interaction, interaction.guild_id, "server")
             await interaction.followup.send(
-            embed=view.create_leaderboard_embed(),
+            embed=await view.create_leaderboard_embed(),
             view=view,
             ephemeral=True
             )
@@ -420,6 +513,7 @@ class WordleCog(commands.Cog):
                 "   ⬛ = Buchstabe nicht im Wort\n\n"
                 "💡 **Tipps:**\n"
                 "- Nutze maximal 3 Tipps pro Spiel\n"
+                "- Der Solver 🧠 schlägt den Rateversuch mit der meisten Information vor und kostet einen Tipp\n"
                 "- Vergleiche dich mit anderen über die Ranglisten"
             ),
             color=discord.Color.blue()
@@ -433,6 +527,76 @@ class WordleCog(commands.Cog):
     async def search_stats(self, interaction: discord.Interaction):
         await interaction.response.send_modal(SearchModal(self))
     
+    @app_commands.command(name="game", description="Zeige ein Spiel anhand seiner ID")
+    @app_commands.describe(game_id="Die 8-stellige Spiel-ID")
+    async def game_command(self, interaction: discord.Interaction, game_id: str):
+        game_id = game_id.strip().upper()
+        owner = self.history.get_game_owner(game_id)
+        own_anon_id = self.settings.get_settings(interaction.user.id)["anon_id"]
+
+        # Anonyme Spiele sieht nur ihr Besitzer, ihre Existenz wird nicht verraten
+        if owner is None or (owner[1] is not None and owner[1] != own_anon_id):
+            await interaction.response.send_message("❌ Kein Spiel mit dieser ID gefunden!", ephemeral=True)
+            return
+
+        owner_id, owner_anon_id = owner
+        if owner_id is not None and owner_id != interaction.user.id \
+                and not self.settings.get_settings(owner_id)["history_public"]:
+            await interaction.response.send_message("❌ Diese Historie ist privat!", ephemeral=True)
+            return
+
+        player = "🕵️ Anonym" if owner_anon_id is not None else f"<@{owner_id}>"
+        embed = create_game_id_embed(self.history.get_game(game_id), player)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="serverstats", description="Auswertung aller Spiele dieses Servers")
+    @app_commands.guild_only()
+    @app_commands.default_permissions(administrator=True)
+    async def server_stats_command(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            await self.analytics.load()
+        except RuntimeError:
+            await interaction.followup.send("❌ Die Auswertung ist gerade nicht verfügbar!", ephemeral=True)
+            return
+        guild_id = interaction.guild_id
+        embed = create_server_stats_embed(
+            interaction.guild.name,
+            self.analytics.overview(guild_id),
+            self.analytics.by_hour(guild_id),
+            self.analytics.by_week(guild_id)
+        )
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="wordlist", description="Wortliste dieses Servers anzeigen oder wechseln")
+    @app_commands.describe(liste="Name der Wortliste, z.B. words2 (leer zeigt alle Listen)")
+    @app_commands.default_permissions(administrator=True)
+    async def word_list_command(self, interaction: discord.Interaction, liste: Optional[str] = None):
+        if liste is not None:
+            if liste not in self.word_bank.lists:
+                await interaction.response.send_message(
+                    f"❌ Unbekannte Wortliste! Verfügbar: {', '.join(self.word_bank.names())}", ephemeral=True
+                )
+                return
+            self.config.set_word_list(interaction.guild_id, liste)
+
+        current = self.word_bank.get(self.config.get_word_list(interaction.guild_id))
+        lines = [
+            f"{'▸' if name == current.name else '▹'} `{name}` – {len(self.word_bank.get(name))} Wörter"
+            for name in self.word_bank.names()
+        ]
+        embed = discord.Embed(
+            title="📚 Wortlisten",
+            description="\n".join(lines),
+            color=discord.Color.blue()
+        )
+        embed.set_footer(text=f"Neue Spiele auf diesem Server nutzen: {current.name}")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @commands.Cog.listener()
+    async def on_game_finished(self, guild_id: int, user_id: int, game_entry: dict):
+        await self.analytics.on_game_finished(guild_id, user_id, game_entry)
+
     @app_commands.command(name="settings", description="Privatsphäre-Einstellungen")
     async def user_settings_command(self, interaction: discord.Interaction):
         await self.open_settings(interaction)
@@ -473,31 +637,11 @@ class WordleCog(commands.Cog):
                 await interaction.response.send_message("❌ Diese Statistiken sind privat!", ephemeral=True)
                 return
             
-            public_games = [g for g in self.history.get_user_games(user.id, "global") if not g.get("anonymous", False)]
-            anon_games = self.history.get_anonymous_games(settings["anon_id"])
-            
-            embed = discord.Embed(title="📊 Statistiken", color=discord.Color.gold())
-            
-            if public_games or anon_games:
-                if public_games:
-                    embed.add_field(
-                        name="Öffentliche Spiele",
-                        value=f"✅ {sum(g['won'] for g in public_games)} Siege\n"
-                              f"❌ {len(public_games)-sum(g['won'] for g in public_games)} Niederlagen\n"
-                              f"📊 {sum(g['won'] for g in public_games)/len(public_games)*100:.1f}% Winrate",
-                        inline=True
-                    )
-                
-                if anon_games:
-                    embed.add_field(
-                        name="🎭 Anonyme Spiele",
-                        value=f"✅ {sum(g['won'] for g in anon_games)} Siege\n"
-                              f"❌ {len(anon_games)-sum(g['won'] for g in anon_games)} Niederlagen\n"
-                              f"📊 {sum(g['won'] for g in anon_games)/len(anon_games)*100:.1f}% Winrate",
-                        inline=True
-                    )
-            else:
-                embed.description = "📭 Noch keine Spiele gespielt!"
+            # Eine laufende Zusammenfassung je Bereich, unabhängig von der Anzahl der Spiele
+            embed = create_stats_embed(
+                self.history.get_summary(user_id=user.id),
+                self.history.get_summary(anon_id=settings["anon_id"])
+            )
             
             await interaction.response.send_message(embed=embed, ephemeral=True)
 
@@ -505,14 +649,9 @@ class WordleCog(commands.Cog):
             await interaction.response.send_message("❌ Fehler beim Laden der Statistiken!", ephemeral=True)
             print(f"Stats Error: {str(e)}")
 
-        def get_daily_rank(self, user_id: int):
-            leaderboard = self.daily_challenge.get_leaderboard()
-            user_str = str(user_id)
-            return next((i+1 for i, (u_id, _) in enumerate(leaderboard) if u_id == user_str), None)
-
     @app_commands.command(name="achievements", description="Zeige deine Achievements")
     async def _show_achievements(self, interaction: discord.Interaction):
-        user_achievements = self.history.data["achievements"].get(str(interaction.user.id), {})
+        user_achievements = self.history.get_achievements(interaction.user.id)
     
         embed = discord.Embed(
         title=f"🏆 Achievements - {interaction.user.display_name}",
@@ -545,10 +684,7 @@ class WordleCog(commands.Cog):
             await interaction.response.send_message("❌ Du hast bereits ein aktives Spiel!", ephemeral=True)
             return
         
-        daily_word = self.daily_challenge.get_daily_word()
-        game = WordleGame(user_id)
-        game.secret_word = daily_word
-        self.games[user_id] = game
+        self.games[user_id] = self.new_daily_game(user_id, interaction.guild_id)
         
         view = GameView(self, user_id)
         await interaction.response.send_message(
@@ -2,12 +2,14 @@ import discord
 import os
 import asyncio
 import datetime
+import signal
 import json
 from pathlib import Path
 from dotenv import load_dotenv
 from discord.ext import commands
 from cogs.wordle_cog import WordleCog
 from views.game_views import MainMenu
+from models.presence_stats import PresenceStats
 
 # Worde Variablen. When use one do a # behind the variable and write # - used
 load_dotenv()
@@ -23,16 +25,6 @@ COUNT_FILE = os.getenv("COUNT_FILE")
 CUSTOM_ACTIVITY = os.getenv("CUSTOM_ACTIVITY", None)
 
 
-if not os.path.exists(WORDS_FILE):
-    with open(WORDS_FILE, "w") as f:
-        f.write("\n".join(["apfel", "birne", "banane", "mango", "beere"]))
-
-with open(WORDS_FILE) as f:
-    WORDS = [w.strip().lower() for w in f.readlines() if len(w.strip()) == 5]
-
-if not WORDS:
-    raise ValueError("Keine gültigen Wörter in der Datei!")
-
 intents = discord.Intents.default()
 intents.message_content = True
 intents.guilds = True
@@ -40,27 +32,14 @@ intents.members = True
 
 bot = commands.Bot(command_prefix="!", intents=intents)
 presence_counter = 0
+presence_stats = PresenceStats()
 
 def get_total_players():
     """Gibt die korrekte Anzahl mit angepasster Grammatik zurück"""
     try:
-        cutoff_date = datetime.datetime.now() - datetime.timedelta(days=30)
-        
-        with open(DATA_FILE) as f:
-            data = json.load(f)
-            global_users = data.get("global", {}).get("users", {})
-            
-            active_players = set()
-            
-            for user_id, spiele in global_users.items():
-                if spiele:
-                    latest_game = max(spiele, key=lambda x: datetime.datetime.fromisoformat(x["timestamp"]))
-                    game_time = datetime.datetime.fromisoformat(latest_game["timestamp"])
-                    if game_time > cutoff_date:
-                        active_players.add(user_id)
-            
-            count = len(active_players)
-            return f"{count} aktiver Spieler" if count == 1 else f"{count} aktive Spieler"
+        # Spieler mit mindestens einem Spiel in den letzten 30 Tagen, nur aus dem Speicher
+        count = presence_stats.active_players()
+        return f"{count} aktiver Spieler" if count == 1 else f"{count} aktive Spieler"
             
     except Exception as e:
         print(f"Spielerzählfehler: {e}")
@@ -69,70 +48,22 @@ def get_total_players():
 def get_best_player():
     """Gibt den besten Spieler zurück oder motiviert zur Teilnahme bei fehlenden Daten"""
     try:
-        # Prüfe ob Datei existiert
-        if not os.path.exists(DATA_FILE):
+        # Gewonnene Spiele der letzten 24 Stunden, nur aus dem Speicher
+        bester = presence_stats.best_player()
+        if not bester:
             return "Sei du doch der Beste!", 0, 0, 0
 
-        # Prüfe ob Datei leer ist
-        with open(DATA_FILE, 'r') as f:
-            file_content = f.read()
-            if not file_content.strip():
-                return "Sei du doch der Beste!", 0, 0, 0
-
-            # Lade und validiere Daten
-            data = json.loads(file_content)
-            if "global" not in data or "users" not in data["global"]:
-                return "Sei du doch der Beste!", 0, 0, 0
-
-            global_users = data["global"]["users"]
-            if not global_users:
-                return "Sei du doch der Beste!", 0, 0, 0
-
-            # Analysiere Spiele
-            cutoff_date = datetime.datetime.now() - datetime.timedelta(hours=24)
-            player_stats = []
-
-            for user_id, all_games in global_users.items():
-                won_games = [
-                    g for g in all_games 
-                    if g.get("won", False) 
-                    and datetime.datetime.fromisoformat(g["timestamp"]) > cutoff_date
-                ]
-                
-                if not won_games:
-                    continue
-
-                total_wins = len(won_games)
-                total_attempts = sum(g["attempts"] for g in won_games)
-                total_hints = sum(g["hints"] for g in won_games)
-                avg_attempts = total_attempts / total_wins
-                avg_hints = total_hints / total_wins
-
-                player_stats.append((
-                    -total_wins,    # Meiste Siege zuerst
-                    avg_attempts,   # Wenigste Versuche
-                    avg_hints,      # Wenigste Tipps
-                    user_id
-                ))
-
-            if not player_stats:
-                return "Sei du doch der Beste!", 0, 0, 0
-
-            player_stats.sort()
-            bester = player_stats[0]
-            user = bot.get_user(int(bester[3]))
-            name = user.name if user else f"Spieler {bester[3][-4:]}"
-
-            # Debug-Ausgabe
-            print(f"\n🔍 Aktueller Topspieler: {name}")
-            print(f"🏆 Siege: {-bester[0]}")
-            print(f"🎯 Ø-Versuche: {bester[1]:.1f}")
-            print(f"💡 Ø-Tipps: {bester[2]:.1f}")
-
-            return name, -bester[0], bester[1], bester[2]
-
-    except json.JSONDecodeError:
-        print("⚠️ Ungültiges JSON-Format in der Datei")
+        user = bot.get_user(bester[0])
+        name = user.name if user else f"Spieler {str(bester[0])[-4:]}"
+
+        # Debug-Ausgabe
+        print(f"\n🔍 Aktueller Topspieler: {name}")
+        print(f"🏆 Siege: {bester[1]}")
+        print(f"🎯 Ø-Versuche: {bester[2]:.1f}")
+        print(f"💡 Ø-Tipps: {bester[3]:.1f}")
+
+        return name, bester[1], bester[2], bester[3]
+
     except KeyError as e:
         print(f"⚠️ Fehlender Schlüssel in Daten: {str(e)}")
     except Exception as e:
@@ -148,7 +79,7 @@ async def update_presence():
         ("🕒 Online seit", lambda t: t),
         ("🌐 Auf", lambda _: f"{len(bot.guilds)} Servern"),
         ("👥", lambda _: get_total_players()),
-        ("🏆 Beste:r", lambda _: (lambda res: f"{res[0]} ({res[3]} Siege)")(get_best_player()))
+        ("🏆 Beste:r", lambda _: (lambda res: f"{res[0]} ({res[1]} Siege)")(get_best_player()))
     ]
 
     while not bot.is_closed():
@@ -173,6 +104,15 @@ async def update_presence():
             print(f"Presence-Fehler: {str(e)}")
             await asyncio.sleep(30)
 
+async def setup_hook():
+    # SIGTERM beendet den Bot sauber, damit die Stores noch gespeichert werden
+    try:
+        bot.loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(bot.close()))
+    except NotImplementedError:
+        pass
+
+bot.setup_hook = setup_hook
+
 @bot.event
 async def on_ready():
     bot.start_time = datetime.datetime.now()
@@ -184,6 +124,8 @@ async def on_ready():
         print(f"Bot Ready")
         
         cog = bot.get_cog("WordleCog")
+        presence_stats.load(cog.history)
+        bot.add_listener(presence_stats.on_game_finished, "on_game_finished")
         for guild in bot.guilds:
             if channel_id := cog.config.get_wordle_channel(guild.id):
                 channel = guild.get_channel(channel_id)
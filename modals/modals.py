@@ -5,6 +5,7 @@ from discord.ui import View, Button, Select, Modal, TextInput
 from models.game_history import GameHistory
 from discord.ext import commands
 from utils.helpers import verify_password
+from utils.allowed_words import is_allowed
 
 # Worde Variablen non used yet. When use one do a # behind the variable
 load_dotenv()
@@ -62,7 +63,11 @@ class GuessModal(Modal, title="Wort eingeben"):
         self.cog = cog
     
     async def on_submit(self, interaction: discord.Interaction):
-        await self.cog.handle_process_guess(interaction, self.guess.value)
+        # Unbekannte Wörter kosten keinen Versuch
+        if not is_allowed(self.guess.value.strip()):
+            await interaction.response.send_message("❌ Dieses Wort kenne ich nicht!", ephemeral=True)
+            return
+        await self.cog.handle_process_guess(interaction, self.guess.value.strip())
 
 
 class SearchModal(Modal, title="Benutzer suchen"):
@@ -42,26 +42,23 @@ class AchievementSystem:
         self.cog = cog
 
     def check_achievements(self, user_id: int, game: WordleGame):
-        self.cog.history.data.setdefault("achievements", {})
-        
-        user_achievements = self.cog.history.data["achievements"].setdefault(str(user_id), {})
+        user_achievements = self.cog.history.get_achievements(user_id)
         new_achievements = []
         
-        total_games = len(self.cog.history.get_user_games(user_id, "global")) + len(
-            self.cog.history.get_anonymous_games(
+        total_games = self.cog.history.count_user_games(user_id, "global") + \
+            self.cog.history.count_anonymous_games(
                 self.cog.settings.get_settings(user_id)["anon_id"]
             )
-        )
         
         for achievement_id, data in self.ACHIEVEMENTS.items():
             if achievement_id not in user_achievements:
                 try:
                     if achievement_id == "veteran":
                         if data["condition"](total_games):  # 👈 Nur total_games übergeben
-                            user_achievements[achievement_id] = datetime.now().isoformat()
+                            self.cog.history.unlock_achievement(user_id, achievement_id)
                             new_achievements.append(data)
                     elif data["condition"](game):
-                        user_achievements[achievement_id] = datetime.now().isoformat()
+                        self.cog.history.unlock_achievement(user_id, achievement_id)
                         new_achievements.append(data)
                 except Exception as e:
                     print(f"Achievement check error: {e}")
@@ -0,0 +1,209 @@
+import asyncio
+import os
+import numpy as np
+from dotenv import load_dotenv
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple
+
+# Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE")
+DATA_FILE = os.getenv("DATA_FILE")
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+
+# Spalte -> Datentyp, eine Zeile je Spiel
+COLUMNS = {
+    "time": np.int64,       # Sekunden seit 1970, Ortszeit wie die Zeitstempel der Historie
+    "hour": np.int8,        # Stunde 0-23, einmal beim Anhängen berechnet
+    "user": np.int32,       # Index in GameAnalytics.users, -1 für anonyme Spiele
+    "guild": np.int32,      # Index in GameAnalytics.guilds
+    "won": np.bool_,
+    "attempts": np.int16,
+    "hints": np.int16,
+    "duration": np.float32
+}
+SECONDS_PER_DAY = 86400
+
+
+class GameAnalytics:
+    """Spaltenweise NumPy-Arrays über alle Spiele für Auswertungen.
+
+    Die Spalten werden beim Start einmal im Executor aus der Historie gebaut und
+    danach über das Event "game_finished" fortgeschrieben. Gruppierungen laufen
+    vollständig vektorisiert über np.bincount.
+    """
+
+    def __init__(self, history):
+        self.history = history
+        self.columns: Optional[Dict[str, np.ndarray]] = None
+        self.size = 0
+        self.users: List[int] = []
+        self.user_index: Dict[int, int] = {}
+        self.guilds: List[Optional[int]] = []
+        self.guild_index: Dict[Optional[int], int] = {}
+        self.loading: Optional[asyncio.Task] = None
+        # (guild_id, user_id, Spiel) der Spiele, die während des Aufbaus enden
+        self.pending: Optional[list] = None
+
+    # Aufbau
+
+    def start(self):
+        """Startet den Aufbau der Spalten im Hintergrund"""
+        if self.columns is None and self.loading is None:
+            # Spiele, die während des Aufbaus enden, werden danach nachgetragen
+            self.pending = []
+            self.loading = asyncio.get_running_loop().create_task(self.load_in_background())
+
+    async def load(self):
+        """Wartet, bis die Spalten gebaut sind - vor jeder Auswertung aus dem Event-Loop aufrufen"""
+        self.start()
+        if self.loading is not None:
+            await asyncio.shield(self.loading)
+        if self.columns is None:
+            raise RuntimeError("Auswertungen konnten nicht geladen werden")
+
+    async def load_in_background(self):
+        try:
+            columns, game_ids = await asyncio.get_running_loop().run_in_executor(None, self.build)
+            if self.columns is None:
+                self.finish_loading(columns, game_ids)
+        except Exception as e:
+            print(f"Fehler beim Aufbau der Auswertungen: {e}")
+        finally:
+            self.pending = None
+            self.loading = None
+
+    def ensure_loaded(self):
+        if self.columns is None:
+            self.finish_loading(*self.build())
+
+    def build(self) -> Tuple[Dict[str, np.ndarray], set]:
+        """Liest alle Spiele einmal spaltenweise, gibt die Spalten und die enthaltenen Spiel-IDs zurück"""
+        rows = {name: [] for name in COLUMNS}
+        timestamps = []
+        game_ids = set()
+        for game_id, guild_id, user_id, timestamp, won, attempts, hints, duration in self.history.iter_game_stats():
+            game_ids.add(game_id)
+            timestamps.append(timestamp)
+            rows["user"].append(-1 if user_id is None else self.index_of(self.users, self.user_index, user_id))
+            rows["guild"].append(self.index_of(self.guilds, self.guild_index, guild_id))
+            rows["won"].append(won)
+            rows["attempts"].append(attempts)
+            rows["hints"].append(hints)
+            rows["duration"].append(duration)
+        rows["time"] = to_seconds(timestamps)
+        rows["hour"] = rows["time"] // 3600 % 24
+        return {name: np.asarray(rows[name], dtype=dtype) for name, dtype in COLUMNS.items()}, game_ids
+
+    def finish_loading(self, columns: Dict[str, np.ndarray], game_ids: set):
+        self.columns = columns
+        self.size = len(columns["time"])
+        for guild_id, user_id, game in self.pending or []:
+            if game["id"] not in game_ids:
+                self.append(guild_id, user_id, game)
+
+    def index_of(self, values: list, index: dict, value) -> int:
+        if value not in index:
+            index[value] = len(values)
+            values.append(value)
+        return index[value]
+
+    async def on_game_finished(self, guild_id: int, user_id: int, game_entry: dict):
+        user_id = None if game_entry["anonymous"] else user_id
+        if self.columns is None:
+            # Noch nicht gebaut, der Aufbau liest das Spiel dann aus der Historie oder trägt es nach
+            if self.pending is not None:
+                self.pending.append((guild_id, user_id, game_entry))
+            return
+        self.append(guild_id, user_id, game_entry)
+
+    def append(self, guild_id: Optional[int], user_id: Optional[int], game: dict):
+        if self.size == len(self.columns["time"]):
+            # Kapazität verdoppeln, damit Anhängen amortisiert O(1) bleibt
+            capacity = max(2 * self.size, 1024)
+            for name, column in self.columns.items():
+                grown = np.zeros(capacity, dtype=column.dtype)
+                grown[:self.size] = column[:self.size]
+                self.columns[name] = grown
+
+        seconds = to_seconds([game["timestamp"]])[0]
+        row = {
+            "time": seconds,
+            "hour": seconds // 3600 % 24,
+            "user": -1 if user_id is None else self.index_of(self.users, self.user_index, user_id),
+            "guild": self.index_of(self.guilds, self.guild_index, guild_id),
+            "won": game["won"],
+            "attempts": game["attempts"],
+            "hints": game["hints"],
+            "duration": game["duration"]
+        }
+        for name, value in row.items():
+            self.columns[name][self.size] = value
+        self.size += 1
+
+    # Auswertungen
+
+    def column(self, name: str) -> np.ndarray:
+        self.ensure_loaded()
+        return self.columns[name][:self.size]
+
+    def select(self, guild_id: Optional[int] = None, since: Optional[datetime] = None) -> np.ndarray:
+        """Zeilennummern aller Spiele eines Servers und/oder ab einem Zeitpunkt.
+        Zeilennummern mit take() sind deutlich schneller als Bool-Masken."""
+        self.ensure_loaded()
+        mask = np.ones(self.size, dtype=np.bool_)
+        if guild_id is not None:
+            if guild_id not in self.guild_index:
+                return np.empty(0, dtype=np.intp)
+            mask &= self.column("guild") == self.guild_index[guild_id]
+        if since is not None:
+            mask &= self.column("time") >= to_seconds([since.isoformat()])[0]
+        return np.flatnonzero(mask)
+
+    def group_by(self, keys: np.ndarray, rows: np.ndarray, groups: int) -> Dict[str, np.ndarray]:
+        """Anzahl und Summen je Gruppe, `keys` enthält für jede Zeile in `rows` eine Gruppe in [0, groups)"""
+        keys = keys.astype(np.intp)
+        result = {"games": np.bincount(keys, minlength=groups)}
+        for name in ("won", "attempts", "hints", "duration"):
+            result[name] = np.bincount(keys, weights=self.column(name).take(rows), minlength=groups)
+        return result
+
+    def overview(self, guild_id: Optional[int] = None) -> Dict[str, float]:
+        rows = self.select(guild_id)
+        if not len(rows):
+            return {"games": 0}
+        users = self.column("user").take(rows)
+        return {
+            "games": len(rows),
+            "players": int(np.count_nonzero(np.bincount(users[users >= 0], minlength=len(self.users)))),
+            "win_rate": float(self.column("won").take(rows).mean()),
+            "avg_attempts": float(self.column("attempts").take(rows).mean()),
+            "avg_hints": float(self.column("hints").take(rows).mean()),
+            "avg_duration": float(self.column("duration").take(rows).mean())
+        }
+
+    def by_hour(self, guild_id: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Summen je Tagesstunde 0-23"""
+        rows = self.select(guild_id)
+        return self.group_by(self.column("hour").take(rows), rows, 24)
+
+    def by_week(self, guild_id: Optional[int] = None, weeks: int = 4,
+                now: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+        """Summen der letzten `weeks` Wochen, Gruppe 0 sind die letzten 7 Tage"""
+        now = now or datetime.now()
+        now_seconds = to_seconds([now.isoformat()])[0]
+        since = now_seconds - weeks * 7 * SECONDS_PER_DAY
+        rows = self.select(guild_id)
+        times = self.column("time").take(rows)
+        recent = (times > since) & (times <= now_seconds)
+        rows, times = rows[recent], times[recent]
+        return self.group_by((now_seconds - times) // (7 * SECONDS_PER_DAY), rows, weeks)
+
+
+def to_seconds(timestamps: List[str]) -> np.ndarray:
+    """ISO-Zeitstempel (mit oder ohne Mikrosekunden) als Sekunden seit 1970"""
+    return np.array(timestamps, dtype="datetime64[us]").astype("datetime64[s]").astype(np.int64)
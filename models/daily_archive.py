@@ -0,0 +1,118 @@
+import json
+import os
+from dotenv import load_dotenv
+from datetime import date, timedelta
+from typing import Optional, List, Dict, Tuple
+from models.persistence import PersistentStore, write_json_atomic
+from models.daily_challenge import daily_key
+
+# Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE")
+DATA_FILE = os.getenv("DATA_FILE")
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+DAILY_ARCHIVE_DIR = os.getenv("DAILY_ARCHIVE_DIR", "daily_archive") # - used
+
+
+class DailyArchive(PersistentStore):
+    """Abgeschlossene Daily Challenges, eine Datei je Monat in DAILY_ARCHIVE_DIR.
+
+    Ein Monat enthält je Tag das Wort und alle Teilnehmer und wird erst bei
+    Bedarf geladen. index.json führt je Spieler seine Ergebnisse als
+    {Tag: [Versuche, Gewonnen]}, damit Serien ohne die Monatsdateien
+    auskommen. Unlesbare Dateien brechen ab, statt beim nächsten Flush durch
+    leere überschrieben zu werden.
+    """
+
+    def __init__(self, directory: str = DAILY_ARCHIVE_DIR):
+        self.directory = directory
+        self.months: Dict[str, dict] = {}
+        self.dirty_months = set()
+        self.index = self.load_index()
+
+    def index_path(self) -> str:
+        return os.path.join(self.directory, "index.json")
+
+    def month_path(self, month: str) -> str:
+        return os.path.join(self.directory, f"{month}.json")
+
+    def read_file(self, path: str, default: dict) -> dict:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return default
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path} ist beschädigt und wird nicht überschrieben: {e}") from e
+
+    def load_index(self) -> dict:
+        return self.read_file(self.index_path(), {"users": {}})
+
+    def get_month(self, month: str) -> dict:
+        if month not in self.months:
+            self.months[month] = self.read_file(self.month_path(month), {"days": {}})
+        return self.months[month]
+
+    def archive_day(self, day: date, word: str, participants: Dict[str, dict]):
+        day_str = day.isoformat()
+        month = day_str[:7]
+        self.get_month(month)["days"][day_str] = {"word": word, "participants": dict(participants)}
+        for user_str, data in participants.items():
+            self.index["users"].setdefault(user_str, {})[day_str] = [data["attempts"], data.get("won", True)]
+        self.dirty_months.add(month)
+        self.mark_dirty()
+
+    def snapshot(self):
+        # Tage und Ergebnislisten werden nie verändert, flache Kopien reichen
+        months = {month: {"days": dict(self.months[month]["days"])} for month in self.dirty_months}
+        self.dirty_months = set()
+        index = {"users": {user_str: dict(results) for user_str, results in self.index["users"].items()}}
+        return months, index
+
+    def write(self, payload):
+        months, index = payload
+        os.makedirs(self.directory, exist_ok=True)
+        for month, data in months.items():
+            write_json_atomic(self.month_path(month), data, separators=(",", ":"))
+        write_json_atomic(self.index_path(), index, separators=(",", ":"))
+
+    def restore(self, payload):
+        months, _ = payload
+        self.dirty_months.update(months)
+        self.mark_dirty()
+
+    # Abfragen
+
+    def get_day(self, day: date) -> Optional[dict]:
+        day_str = day.isoformat()
+        return self.get_month(day_str[:7])["days"].get(day_str)
+
+    def get_day_results(self, day: date) -> List[Tuple[str, dict]]:
+        """(user_id, Eintrag) Paare eines archivierten Tages, sortiert wie das Tagesranking"""
+        archived = self.get_day(day)
+        if archived is None:
+            return []
+        return sorted(archived["participants"].items(), key=daily_key)
+
+    def get_streak(self, user_id: int, until: date) -> Tuple[int, int]:
+        """Gibt (gewonnene Tage in Folge bis einschließlich `until`, längste Serie) zurück"""
+        results = self.index["users"].get(str(user_id), {})
+        current = 0
+        day = until
+        while results.get(day.isoformat(), (0, False))[1]:
+            current += 1
+            day -= timedelta(days=1)
+
+        best = streak = 0
+        previous = None
+        for day_str in sorted(results):
+            won = results[day_str][1]
+            day = date.fromisoformat(day_str)
+            streak = streak + 1 if won and previous == day - timedelta(days=1) else int(won)
+            best = max(best, streak)
+            previous = day
+        return current, best
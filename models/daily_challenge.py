@@ -1,10 +1,14 @@
+import hashlib
 import json
 import random
 import os
 from dotenv import load_dotenv
-from datetime import datetime
-from utils.helpers import WORDS
-from typing import Optional, List, Dict, Any
+from datetime import datetime, date, timedelta
+from functools import lru_cache
+from utils.word_bank import WordList, get_word_bank
+from typing import Optional, List, Dict, Any, Tuple
+from sortedcontainers import SortedKeyList
+from models.persistence import PersistentStore, write_json_atomic
 
 # Worde Variablen. When use one do a # behind the variable and write # - used
 load_dotenv()
@@ -14,48 +18,159 @@ WORDS_FILE = os.getenv("WORDS_FILE")
 DATA_FILE = os.getenv("DATA_FILE") # - used 
 CONFIG_FILE = os.getenv("CONFIG_FILE")
 SETTINGS_FILE = os.getenv("SETTINGS_FILE")
-DAILY_FILE = os.getenv("DAILY_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE") # - used
+DAILY_SEED = os.getenv("DAILY_SEED", "wordle") # - used
+DAILY_PER_GUILD = os.getenv("DAILY_PER_GUILD", "false").lower() == "true" # - used
 
-class DailyChallenge:
-    def __init__(self):
+# Tag 0 der Wortfolge
+DAILY_EPOCH = date(2025, 1, 1)
+
+
+@lru_cache(maxsize=32)
+def daily_order(word_list: WordList, key: str) -> Tuple[str, ...]:
+    """Mit `key` gemischte, sortierte Liste - unabhängig von der Reihenfolge in der Datei"""
+    order = sorted(word_list.words)
+    random.Random(int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big")).shuffle(order)
+    return tuple(order)
+
+
+def daily_word(word_list: WordList, day: date, guild_id: Optional[int] = None, seed: str = DAILY_SEED) -> str:
+    """Wort des Tages ohne gespeicherten Zustand: jeder Durchlauf durch die Liste ist eine
+    eigene Permutation, kein Wort kommt doppelt, bevor alle einmal dran waren"""
+    cycle, position = divmod((day - DAILY_EPOCH).days, len(word_list))
+    return daily_order(word_list, f"{seed}:{guild_id}:{word_list.name}:{cycle}")[position]
+
+
+def daily_key(participant: Tuple[str, dict]) -> tuple:
+    """Gewonnen vor verloren, dann wenigste Versuche, kürzeste Zeit, wer zuerst fertig war"""
+    user_str, data = participant
+    return not data.get("won", True), data["attempts"], data.get("duration", 0.0), data["timestamp"], user_str
+
+
+class DailyChallenge(PersistentStore):
+    def __init__(self, archive=None):
+        # DailyArchive, in das abgelaufene Tage verschoben werden
+        self.archive = archive
         self.data = self.load_data()
+        # Liste und Wort je Server (ohne DAILY_PER_GUILD nur unter None), beim ersten Abruf des Tages festgelegt
+        self.pinned: Dict[Optional[int], Tuple[WordList, str]] = {}
+        # Rangliste des Tages, wird mit jedem Teilnehmer fortgeschrieben
+        self.ranking = SortedKeyList(self.data["participants"].items(), key=daily_key)
     
     def load_data(self):
         try:
             with open(DAILY_FILE) as f:
                 data = json.load(f)
                 data["last_updated"] = datetime.strptime(data["last_updated"], "%Y-%m-%d").date()
+                # Ältere Dateien speichern das gezogene Wort noch als "current_word"
+                if "current_word" in data:
+                    data["word"] = data.pop("current_word")
                 return data
-        except (FileNotFoundError, KeyError, json.JSONDecodeError):
+        except (FileNotFoundError, KeyError, TypeError, json.JSONDecodeError):
             return {
-                "current_word": None,
                 "last_updated": None,
                 "participants": {}
             }
     
     def save_data(self):
-        with open(DAILY_FILE, "w") as f:
-            save_data = self.data.copy()
-            save_data["last_updated"] = self.data["last_updated"].isoformat()
-            json.dump(save_data, f, indent=2)
+        """Markiert die Daily-Daten zum Speichern, geschrieben wird im Hintergrund"""
+        self.mark_dirty()
+    
+    def snapshot(self):
+        save_data = self.data.copy()
+        save_data["last_updated"] = self.data["last_updated"].isoformat()
+        save_data["participants"] = dict(self.data["participants"])
+        return save_data
     
-    def get_daily_word(self):
+    def write(self, payload):
+        write_json_atomic(DAILY_FILE, payload, indent=2)
+    
+    def daily_list(self, guild_list: Optional[WordList] = None) -> WordList:
+        """Liste des Tagesworts: mit DAILY_PER_GUILD die des Servers, sonst WORDS_FILE"""
+        return guild_list if DAILY_PER_GUILD and guild_list is not None else get_word_bank().get()
+    
+    def get_daily(self, guild_id: Optional[int] = None, guild_list: Optional[WordList] = None) -> Tuple[WordList, str]:
+        """Liste und Wort des Tages. Beide werden beim ersten Abruf festgehalten, Neuladen der
+        Wortlisten oder /wordlist ändern das heutige Wort nicht mehr"""
+        self.reset_if_new_day()
+        key = guild_id if DAILY_PER_GUILD else None
+        pinned = self.pinned.get(key)
+        if pinned is None:
+            word_list = self.daily_list(guild_list)
+            # Nach einem Neustart gilt das gespeicherte Wort weiter, solange die Liste es noch enthält
+            stored = self.data.get("word") if key is None else None
+            word = stored if stored in word_list else daily_word(word_list, self.data["last_updated"], key)
+            pinned = self.pinned[key] = (word_list, word)
+            if key is None and word != stored:
+                self.data["word"] = word
+                self.save_data()
+        return pinned
+    
+    def get_daily_word(self, guild_id: Optional[int] = None, guild_list: Optional[WordList] = None) -> str:
+        return self.get_daily(guild_id, guild_list)[1]
+    
+    def reset_if_new_day(self):
         if self.should_reset():
-            self.data["current_word"] = random.choice(WORDS)
+            if self.archive is not None and self.data["last_updated"] is not None:
+                # Archiviert wird das gespielte Wort. Fehlt es, wurde es an dem Tag nie abgerufen
+                # (oder nur je Server), dann bleibt es beim berechneten Wort der Standardliste.
+                word = self.data.get("word") or daily_word(self.daily_list(), self.data["last_updated"])
+                self.archive.archive_day(self.data["last_updated"], word, self.data["participants"])
+            # Kein Schreiben nötig: der neue Tag landet mit dem ersten Abruf des Worts oder dem ersten
+            # Teilnehmer in DAILY_FILE, bis dahin archiviert ein Neustart den alten Tag einfach noch einmal
             self.data["last_updated"] = datetime.now().date()
             self.data["participants"] = {}
-            self.save_data()
-        return self.data["current_word"]
+            self.data.pop("word", None)
+            self.pinned.clear()
+            self.ranking.clear()
     
     def should_reset(self):
         return self.data["last_updated"] != datetime.now().date()
     
     def has_played(self, user_id: int):
+        self.reset_if_new_day()
         return str(user_id) in self.data["participants"]
     
-    def add_participant(self, user_id: int, attempts: int):
-        self.data["participants"][str(user_id)] = {
+    def add_participant(self, user_id: int, attempts: int, won: bool = True, duration: float = 0.0):
+        self.reset_if_new_day()
+        user_str = str(user_id)
+        old_data = self.data["participants"].get(user_str)
+        if old_data is not None:
+            self.ranking.remove((user_str, old_data))
+        # Einträge werden ersetzt, nie verändert - snapshot() kopiert nur das Dict
+        data = self.data["participants"][user_str] = {
             "attempts": attempts,
+            "won": won,
+            "duration": duration,
             "timestamp": datetime.now().isoformat()
         }
-        self.save_data()
\ No newline at end of file
+        self.ranking.add((user_str, data))
+        self.save_data()
+    
+    def get_leaderboard(self, offset: int = 0, limit: Optional[int] = None) -> List[Tuple[str, dict]]:
+        """(user_id, Eintrag) Paare des heutigen Rankings ab Platz offset + 1"""
+        self.reset_if_new_day()
+        stop = None if limit is None else offset + limit
+        return list(self.ranking.islice(offset, stop))
+    
+    def get_rank(self, user_id: int) -> Optional[int]:
+        self.reset_if_new_day()
+        user_str = str(user_id)
+        data = self.data["participants"].get(user_str)
+        return None if data is None else self.ranking.index((user_str, data)) + 1
+    
+    def count_participants(self) -> int:
+        self.reset_if_new_day()
+        return len(self.ranking)
+    
+    def get_streak(self, user_id: int) -> Tuple[int, int]:
+        """Gibt (aktuelle, längste) Serie gewonnener Daily Challenges zurück, der heutige Tag zählt mit"""
+        self.reset_if_new_day()
+        if self.archive is None:
+            return 0, 0
+        today = self.data["last_updated"]
+        current, best = self.archive.get_streak(user_id, today - timedelta(days=1))
+        data = self.data["participants"].get(str(user_id))
+        if data is not None:
+            current = current + 1 if data.get("won", True) else 0
+        return current, max(best, current)
\ No newline at end of file
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import re
+import numpy as np
+from dotenv import load_dotenv
+from typing import Optional, List, Dict
+from utils.word_bank import WordList, get_word_bank
+
+# Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE")
+DATA_FILE = os.getenv("DATA_FILE")
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+FEEDBACK_CACHE_DIR = os.getenv("FEEDBACK_CACHE_DIR", "cache") # - used
+
+# Farbe je Stelle als Ziffer zur Basis 3, Stelle i zählt 3**i - 243 Muster passen in ein uint8
+ABSENT, PRESENT, CORRECT = 0, 1, 2
+EMOJIS = {ABSENT: "⬛", PRESENT: "🟨", CORRECT: "🟩"}
+ALL_CORRECT = sum(CORRECT * 3 ** i for i in range(5))
+PLACES = 3 ** np.arange(5)
+
+
+def score(guess: str, answer: str) -> int:
+    """Muster eines einzelnen Wortpaars, doppelte Buchstaben werden nur so oft gelb wie sie übrig sind"""
+    remaining = [a for g, a in zip(guess, answer) if g != a]
+    pattern = 0
+    for i, (g, a) in enumerate(zip(guess, answer)):
+        if g == a:
+            pattern += CORRECT * 3 ** i
+        elif g in remaining:
+            remaining.remove(g)
+            pattern += PRESENT * 3 ** i
+    return pattern
+
+
+def decode(pattern: int) -> List[str]:
+    """Muster als Emoji-Liste wie in WordleGame.attempts"""
+    return [EMOJIS[pattern // 3 ** i % 3] for i in range(5)]
+
+
+def encode(result: List[str]) -> int:
+    """Emoji-Liste aus WordleGame.attempts zurück in ein Muster"""
+    codes = {emoji: code for code, emoji in EMOJIS.items()}
+    return sum(codes[emoji] * 3 ** i for i, emoji in enumerate(result))
+
+
+def compile_matrix(guesses: List[str], answers: List[str], chunk_rows: int = 512) -> np.ndarray:
+    """Muster aller Paare als uint8-Matrix [Rateversuch, Lösung], vektorisiert je Stelle.
+    Rateversuche laufen in Blöcken, damit die Zwischen-Arrays im Cache bleiben."""
+    g_all = np.array([[ord(c) for c in word] for word in guesses], dtype=np.uint16).reshape(-1, 5)
+    a = np.array([[ord(c) for c in word] for word in answers], dtype=np.uint16).reshape(-1, 5)
+    a_cols = [a[None, :, k] for k in range(5)]
+    matrix = np.empty((len(guesses), len(answers)), dtype=np.uint8)
+    for start in range(0, len(guesses), chunk_rows):
+        g_cols = [g_all[start:start + chunk_rows, k, None] for k in range(5)]
+        green = [g_cols[k] == a_cols[k] for k in range(5)]
+        pattern = np.zeros((len(g_cols[0]), len(answers)), dtype=np.uint8)
+        for i in range(5):
+            # Gelb, wenn die Lösung den Buchstaben außerhalb der grünen Stellen öfter enthält,
+            # als er vorher im Rateversuch schon nicht-grün vorkam
+            available = np.zeros(pattern.shape, dtype=np.uint8)
+            used = np.zeros(pattern.shape, dtype=np.uint8)
+            for k in range(5):
+                available += (a_cols[k] == g_cols[i]) & ~green[k]
+            for j in range(i):
+                used += (g_cols[j] == g_cols[i]) & ~green[j]
+            present = ~green[i] & (available > used)
+            pattern += np.uint8(CORRECT * 3 ** i) * green[i] + np.uint8(PRESENT * 3 ** i) * present
+        matrix[start:start + chunk_rows] = pattern
+    return matrix
+
+
+class FeedbackMatrix:
+    """Vorberechnete Muster für alle Paare aus Rateversuch- und Lösungsliste.
+
+    Die Matrix wird einmal kompiliert und unter FEEDBACK_CACHE_DIR als .npy
+    abgelegt, der Dateiname enthält `name` und einen Hash der Wortlisten. Danach wird sie
+    nur noch per Memory-Map geöffnet, ein Muster kostet einen Tabellenzugriff.
+    Eine neu geschriebene Matrix löscht ältere Dateien mit demselben `name`.
+    """
+
+    def __init__(self, guesses: List[str], answers: List[str], name: str, cache_dir: str = FEEDBACK_CACHE_DIR):
+        self.name = name
+        self.guesses = list(dict.fromkeys(guesses))
+        self.answers = list(dict.fromkeys(answers))
+        self.guess_index: Dict[str, int] = {word: i for i, word in enumerate(self.guesses)}
+        self.answer_index: Dict[str, int] = {word: i for i, word in enumerate(self.answers)}
+        self.path = self.cache_path(cache_dir)
+        self.matrix = self.load_or_compile()
+
+    def cache_path(self, cache_dir: str) -> str:
+        digest = hashlib.sha1("\n".join(self.guesses + ["|"] + self.answers).encode()).hexdigest()[:16]
+        return os.path.join(cache_dir, f"feedback_{self.name}_{digest}.npy")
+
+    def load_or_compile(self) -> np.ndarray:
+        path = self.path
+        try:
+            matrix = np.load(path, mmap_mode="r")
+            if matrix.shape == (len(self.guesses), len(self.answers)):
+                return matrix
+        except (FileNotFoundError, ValueError):
+            pass
+
+        matrix = compile_matrix(self.guesses, self.answers)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp.npy"
+        np.save(tmp_path, matrix)
+        os.replace(tmp_path, path)
+        self.remove_stale_files()
+        return np.load(path, mmap_mode="r")
+
+    def remove_stale_files(self):
+        """Löscht ältere Hashes derselben Matrix und Dateien ohne Namen aus älteren Versionen"""
+        directory, current = os.path.split(self.path)
+        stale = re.compile(rf"feedback_(?:{re.escape(self.name)}_)?[0-9a-f]{{16}}\.npy")
+        for filename in os.listdir(directory or "."):
+            if filename != current and stale.fullmatch(filename):
+                try:
+                    # Laufende Spiele mit der alten Liste behalten ihre Memory-Map
+                    os.remove(os.path.join(directory, filename))
+                except OSError as e:
+                    print(f"Alte Muster-Matrix {filename} nicht gelöscht: {e}")
+
+    def pattern(self, guess: str, answer: str) -> int:
+        """Muster aus der Matrix, unbekannte Wörter werden direkt berechnet"""
+        g = self.guess_index.get(guess)
+        a = self.answer_index.get(answer)
+        if g is None or a is None:
+            return score(guess, answer)
+        return int(self.matrix[g, a])
+
+    def candidates(self, guess: str, pattern: int, answers: Optional[np.ndarray] = None) -> np.ndarray:
+        """Indizes der Lösungen (aus `answers` oder allen), die zu Rateversuch und Muster passen"""
+        row = self.matrix[self.guess_index[guess]]
+        if answers is None:
+            return np.flatnonzero(row == pattern)
+        return answers[row[answers] == pattern]
+
+
+def get_feedback_matrix(word_list: Optional[WordList] = None) -> FeedbackMatrix:
+    """Matrix einer Wortliste (sonst der Standardliste), beim ersten Aufruf geladen oder kompiliert.
+    Die Matrix hängt an der Liste und verschwindet mit ihr, sobald eine neu geladene Liste sie ablöst."""
+    word_list = word_list or get_word_bank().get()
+    if word_list.feedback is None:
+        word_list.feedback = FeedbackMatrix(list(word_list.words), list(word_list.words), word_list.name)
+    return word_list.feedback
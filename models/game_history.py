@@ -1,72 +1,53 @@
-import json
 import uuid
 import os
 from dotenv import load_dotenv
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from models.user_settings import UserSettings
 from models.server_config import ServerConfig
-from typing import Optional, List, Dict
+from models.storage import HistoryStorage
+from models.json_storage import JsonHistoryStorage
+from models.sqlite_storage import SqliteHistoryStorage
+from models.leaderboard import RankedLeaderboard
+from models.storage import window_start
 
 # Worde Variablen. When use one do a # behind the variable and write # - used
 load_dotenv()
 MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
 MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
 WORDS_FILE = os.getenv("WORDS_FILE")
-DATA_FILE = os.getenv("DATA_FILE") # - used
+DATA_FILE = os.getenv("DATA_FILE")
 CONFIG_FILE = os.getenv("CONFIG_FILE")
 SETTINGS_FILE = os.getenv("SETTINGS_FILE")
 DAILY_FILE = os.getenv("DAILY_FILE")
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json") # - used
+
+STORAGE_BACKENDS = {
+    "json": JsonHistoryStorage,
+    "sqlite": SqliteHistoryStorage
+}
 
 class GameHistory:
-    def __init__(self):
-        self.data = self.load_data()
-    
-    def load_data(self):
-        try:
-            with open(DATA_FILE) as f:
-                return self.validate_data_structure(json.load(f))
-        except (FileNotFoundError, json.JSONDecodeError):
-            return self.default_data_structure()
-    
-    def validate_data_structure(self, data):
-        data.setdefault("guilds", {})
-        data.setdefault("global", {"users": {}})
-        data.setdefault("anonymous_games", {})
-        data.setdefault("achievements", {})
-        data.setdefault("daily_challenges", {}) 
-        
-        # Migration für alte Datensätze
-        for scope in [data["global"], *data["guilds"].values()]:
-            for user_games in scope.get("users", {}).values():
-                for game in user_games:
-                    game.setdefault("id", str(uuid.uuid4())[:8].upper())
-                    game.setdefault("anonymous", False)
-    
-        for anon_games in data["anonymous_games"].values():
-            for game in anon_games:
-                game.setdefault("id", str(uuid.uuid4())[:8].upper())
-                game.setdefault("anonymous", True)
-    
-        return data
-    
-    def default_data_structure(self):
-        return {"guilds": {}, 
-                "global": {"users": {}}, 
-                "anonymous_games": {},
-                "achievements": {},
-                "daily_challenges": {}
-                }
-    
-    def save_data(self):
-        with open(DATA_FILE, "w") as f:
-            json.dump(self.data, f, indent=2)
-    
-    def add_game(self, guild_id: int, user_id: int, game_data: dict):
-        settings = UserSettings().get_settings(user_id)
+    def __init__(self, settings: Optional[UserSettings] = None, storage: Optional[HistoryStorage] = None):
+        self.settings = settings or UserSettings()
+        self.storage = storage or STORAGE_BACKENDS[STORAGE_BACKEND]()
+        # Sortierte Bestenlisten je Bereich ("global" oder Server-ID), erst beim ersten Aufruf aufgebaut
+        self.ranked: Dict[str, RankedLeaderboard] = {}
+        # Zeitfenster-Bestenlisten je Bereich: {Fenster: (Starttag, Bestenliste)}, neu aufgebaut wenn der Starttag wandert
+        self.window_ranked: Dict[str, Dict[str, Tuple[str, RankedLeaderboard]]] = {}
+    
+    def new_game_id(self) -> str:
+        """8-stellige ID, die gegen den ID-Index auf Kollisionen geprüft wird"""
+        while True:
+            game_id = str(uuid.uuid4())[:8].upper()
+            if not self.storage.has_game(game_id):
+                return game_id
+
+    def add_game(self, guild_id: int, user_id: int, game_data: dict) -> dict:
+        settings = self.settings.get_settings(user_id)
     
         game_entry = {
-        "id": str(uuid.uuid4())[:8].upper(),
+        "id": self.new_game_id(),
         "timestamp": datetime.now().isoformat(),
         "won": game_data["won"],
         "word": game_data["word"],
@@ -79,44 +60,102 @@ class GameHistory:
         }
     
         if settings["anonymous"]:
-            anon_id = settings["anon_id"]
-            self.data["anonymous_games"].setdefault(anon_id, []).insert(0, game_entry)
-            settings["anon_games"].insert(0, game_entry["id"])
-            UserSettings().update_settings(user_id, anon_games=settings["anon_games"])
+            # Die Anonym-Liste führt der Speicher, settings["anon_games"] wird nicht mehr gepflegt
+            self.storage.add_game(guild_id, None, settings["anon_id"], game_entry)
         else:
-            guild_str = str(guild_id)
-            user_str = str(user_id)
-            self.data["guilds"].setdefault(guild_str, {"users": {}})
-            self.data["guilds"][guild_str]["users"].setdefault(user_str, []).insert(0, game_entry)
-            self.data["global"]["users"].setdefault(user_str, []).insert(0, game_entry)
+            self.storage.add_game(guild_id, user_id, None, game_entry)
+            for scope, scope_guild_id in (("global", None), ("server", guild_id)):
+                key = self.ranked_key(scope, scope_guild_id)
+                ranked = self.ranked.get(key)
+                if ranked is not None:
+                    entry = self.storage.get_leaderboard_entry(scope, scope_guild_id, user_id)
+                    if entry is not None:
+                        ranked.update(entry)
+                # Wie die Gesamtliste nur den Eintrag des Spielers ersetzen, aus seinen Tages-Buckets
+                for since_day, window_ranked in self.window_ranked.get(key, {}).values():
+                    entry = self.storage.get_window_leaderboard_entry(scope, scope_guild_id, user_id, since_day)
+                    if entry is not None:
+                        window_ranked.update(entry)
+        return game_entry
     
-        self.save_data()
+    def attach_analysis(self, game_id: str, analysis: List[dict]):
+        self.storage.attach_analysis(game_id, analysis)
+    
+    def unlock_achievement(self, user_id: int, achievement_id: str):
+        self.storage.unlock_achievement(user_id, achievement_id, datetime.now().isoformat())
+    
+    def get_achievements(self, user_id: int) -> Dict[str, str]:
+        return self.storage.get_achievements(user_id)
     
     def get_leaderboard(self, scope: str, guild_id: Optional[int] = None) -> List[dict]:
-        source = self.data["global"] if scope == "global" else self.data["guilds"].get(str(guild_id), {"users": {}})
-        leaderboard = []
-        for user_id_str, games in source["users"].items():
-            valid_games = [g for g in games if not g.get("anonymous", False)]
-            total = len(valid_games)
-            if total == 0:
-                continue
-            wins = sum(g["won"] for g in valid_games)
-            avg_attempts = sum(g["attempts"] for g in valid_games) / total
-            win_rate = wins / total
-            last_games = sorted(valid_games[:10], key=lambda x: x["timestamp"], reverse=True)
-            leaderboard.append({
-                "user_id": int(user_id_str),
-                "wins": wins,
-                "total": total,
-                "avg_attempts": avg_attempts,
-                "win_rate": win_rate,
-                "last_games": last_games
-            })
-        return sorted(leaderboard, key=lambda x: (-x["wins"], -x["total"]))
-    
-    def get_user_games(self, user_id: int, scope: str, guild_id: Optional[int] = None) -> List[dict]:
-        source = self.data["global"] if scope == "global" else self.data["guilds"].get(str(guild_id), {"users": {}})
-        return source["users"].get(str(user_id), [])
-    
-    def get_anonymous_games(self, anon_id: str) -> List[dict]:
-        return self.data["anonymous_games"].get(anon_id, [])
\ No newline at end of file
+        return self.storage.get_leaderboard(scope, guild_id)
+    
+    def ranked_key(self, scope: str, guild_id: Optional[int]) -> str:
+        return "global" if scope == "global" else str(guild_id)
+    
+    def get_ranked_leaderboard(self, scope: str, guild_id: Optional[int] = None, window: str = "all") -> RankedLeaderboard:
+        key = self.ranked_key(scope, guild_id)
+        if window == "all":
+            if key not in self.ranked:
+                self.ranked[key] = RankedLeaderboard(self.storage.get_leaderboard(scope, guild_id))
+            return self.ranked[key]
+
+        # Zeitfenster: aus den Tages-Buckets zusammengefasst, neu sobald ein Tag herausfällt
+        since_day = window_start(window)
+        windows = self.window_ranked.setdefault(key, {})
+        cached = windows.get(window)
+        if cached is None or cached[0] != since_day:
+            cached = windows[window] = (
+                since_day, RankedLeaderboard(self.storage.get_window_leaderboard(scope, guild_id, since_day))
+            )
+        return cached[1]
+    
+    def get_leaderboard_page(self, scope: str, guild_id: Optional[int] = None,
+                             offset: int = 0, limit: int = 10, window: str = "all") -> List[dict]:
+        return self.get_ranked_leaderboard(scope, guild_id, window).page(offset, limit)
+    
+    def count_leaderboard(self, scope: str, guild_id: Optional[int] = None, window: str = "all") -> int:
+        return len(self.get_ranked_leaderboard(scope, guild_id, window))
+    
+    def get_leaderboard_rank(self, scope: str, guild_id: Optional[int], user_id: int,
+                             window: str = "all") -> Optional[int]:
+        return self.get_ranked_leaderboard(scope, guild_id, window).rank(user_id)
+    
+    def get_user_games(self, user_id: int, scope: str, guild_id: Optional[int] = None,
+                       offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        return self.storage.get_user_games(user_id, scope, guild_id, offset, limit)
+    
+    def count_user_games(self, user_id: int, scope: str, guild_id: Optional[int] = None) -> int:
+        return self.storage.count_user_games(user_id, scope, guild_id)
+    
+    def get_anonymous_games(self, anon_id: str, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        return self.storage.get_anonymous_games(anon_id, offset, limit)
+    
+    def count_anonymous_games(self, anon_id: str) -> int:
+        return self.storage.count_anonymous_games(anon_id)
+    
+    def get_summary(self, user_id: Optional[int] = None, anon_id: Optional[str] = None) -> Optional[dict]:
+        return self.storage.get_summary(user_id, anon_id)
+    
+    def get_recent_games(self, guild_id: int, offset: int = 0, limit: Optional[int] = None,
+                         anchor: Optional[str] = None) -> List[tuple]:
+        return self.storage.get_recent_games(guild_id, offset, limit, anchor)
+    
+    def count_recent_games(self, guild_id: int, anchor: Optional[str] = None) -> int:
+        return self.storage.count_recent_games(guild_id, anchor)
+    
+    def find_game(self, game_id: str, user_id: Optional[int] = None, anon_id: Optional[str] = None) -> Optional[dict]:
+        return self.storage.find_game(game_id, user_id, anon_id)
+    
+    def get_game(self, game_id: str) -> Optional[dict]:
+        return self.storage.get_game(game_id)
+    
+    def get_game_owner(self, game_id: str) -> Optional[Tuple[Optional[int], Optional[str]]]:
+        return self.storage.get_game_owner(game_id)
+    
+    def iter_public_games_since(self, since: str):
+        return self.storage.iter_public_games_since(since)
+    
+    def iter_game_stats(self):
+        return self.storage.iter_game_stats()
+
@@ -0,0 +1,610 @@
+import time
+import uuid
+import os
+from dotenv import load_dotenv
+from datetime import date, timedelta
+from typing import Optional, List, Dict, Tuple, Iterator
+from models.storage import (HistoryStorage, JournaledFile, newest_first, add_to_aggregate, merge_aggregates,
+                            add_to_summary, leaderboard_entry, leaderboard_key, BUCKET_RETENTION_DAYS,
+                            RECENT_GAMES_LIMIT)
+
+# Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE")
+DATA_FILE = os.getenv("DATA_FILE") # - used
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+JOURNAL_FILE = os.getenv("JOURNAL_FILE", f"{DATA_FILE}.journal") # - used
+HISTORY_DIR = os.getenv("HISTORY_DIR", "history") # - used
+SHARD_IDLE_SECONDS = float(os.getenv("SHARD_IDLE_SECONDS", 1800)) # - used
+
+# Index-Metadaten je Spiel: [Server, Zeitstempel, Gewonnen, Versuche, Tipps, Spieler, Anonym-ID]
+META_GUILD, META_TIMESTAMP, META_WON, META_ATTEMPTS, META_HINTS, META_USER, META_ANON = range(7)
+
+
+class JsonHistoryStorage(HistoryStorage):
+    """Globaler Index in DATA_FILE plus eine Datei je Server in HISTORY_DIR.
+
+    Der Index enthält nur IDs und kompakte Metadaten je Spiel und reicht für
+    globale Bestenliste, Statistiken und Präsenz. Die vollständigen Spiele
+    liegen im Server-Shard, der erst bei Bedarf geladen und nach
+    SHARD_IDLE_SECONDS Inaktivität wieder aus dem Speicher entfernt wird.
+    Über data["meta"] ist jede Spiel-ID samt Besitzer in O(1) auffindbar.
+    ID-Listen werden in Spielreihenfolge angehängt und neueste zuerst gelesen.
+    data["leaderboards"] hält laufende Summen je Bereich ("global" oder Server) und Spieler,
+    data["buckets"] dieselben Summen je Tag für die Zeitfenster-Bestenlisten.
+    Jeder Shard führt in "recent" die IDs seiner letzten RECENT_GAMES_LIMIT Spiele,
+    data["summaries"] die Statistik-Zusammenfassung je Spieler und Anonym-ID.
+    """
+    SCHEMA_VERSION = 9
+
+    def __init__(self):
+        self.index = JournaledFile(DATA_FILE, JOURNAL_FILE)
+        self.shards: Dict[str, JournaledFile] = {}
+        self.last_eviction = time.monotonic()
+        self.index.data = self.load_index()
+
+    # Laden und Migration
+
+    def load_index(self):
+        data = self.index.read_snapshot()
+        if data is None:
+            if not os.path.exists(self.index.journal_path):
+                # Neue Installation: Index sofort als Snapshot anlegen
+                self.index.request_compaction()
+                self.mark_dirty()
+                return self.default_index()
+            # Ohne Snapshot entscheidet die Form der Spiel-Einträge: Version 2 speichert
+            # das ganze Spiel unter "game", aktuelle Einträge nur dessen "meta"
+            record = self.index.first_record("game")
+            if record is not None and "game" in record:
+                data = {}
+            else:
+                # Aktuelles Journal, dessen Snapshot fehlt: auf einem leeren Index einspielen
+                data = self.default_index()
+                self.index.request_compaction()
+                self.mark_dirty()
+
+        # Dateien vor der Versionierung: mit "games" schon normalisiert
+        version = data.get("schema_version", 2 if "games" in data else 0)
+        if version < self.SCHEMA_VERSION:
+            data = self.migrate(data, version)
+        if version >= 3:
+            # Ab Version 3 passt das Journal auf den migrierten Snapshot, vor 3 spielt split_into_shards es ein
+            self.index.replay(self.apply_index_record, data)
+        return data
+
+    def migrate(self, data, version: int):
+        """Bringt ältere Dateien einmalig auf SCHEMA_VERSION, danach wird nichts mehr durchlaufen"""
+        if version < 3:
+            data.setdefault("games", {})
+            data.setdefault("guilds", {})
+            data.setdefault("global", {"users": {}})
+            data.setdefault("anonymous_games", {})
+            data.setdefault("achievements", {})
+            data.setdefault("daily_challenges", {})
+
+        migrations = {
+            1: self.migrate_game_ids,
+            2: self.normalize_layout,
+            3: self.split_into_shards,
+            4: self.add_game_owners,
+            5: self.reverse_to_append_order,
+            6: self.build_leaderboards,
+            7: self.build_buckets,
+            8: self.build_recent_lists,
+            9: self.build_summaries
+        }
+        for target in range(version + 1, self.SCHEMA_VERSION + 1):
+            data = migrations[target](data) or data
+            print(f"Historie migriert auf Version {target}")
+        data["schema_version"] = self.SCHEMA_VERSION
+
+        # Neue Version beim nächsten Flush als Snapshot schreiben
+        self.index.request_compaction()
+        self.mark_dirty()
+        return data
+
+    def migrate_game_ids(self, data):
+        """Version 1: jedes Spiel hat eine ID und ein anonymous-Flag"""
+        for scope in [data["global"], *data["guilds"].values()]:
+            for user_games in scope.get("users", {}).values():
+                for game in user_games:
+                    game.setdefault("id", str(uuid.uuid4())[:8].upper())
+                    game.setdefault("anonymous", False)
+
+        for anon_games in data["anonymous_games"].values():
+            for game in anon_games:
+                game.setdefault("id", str(uuid.uuid4())[:8].upper())
+                game.setdefault("anonymous", True)
+
+    def normalize_layout(self, data):
+        """Version 2: jedes Spiel doppelt in Server- und Global-Liste wird zu ID-Listen"""
+        games = {}
+
+        def store(game):
+            if game["id"] in games and games[game["id"]] != game:
+                game["id"] = str(uuid.uuid4())[:8].upper()
+            games[game["id"]] = game
+            return game["id"]
+
+        # Die Server-Listen sind die eigentlichen Einträge, die globale Liste wird daraus neu aufgebaut
+        global_users = {}
+        for guild_data in data["guilds"].values():
+            for user_str, user_games in guild_data.setdefault("users", {}).items():
+                game_ids = [store(game) for game in user_games]
+                guild_data["users"][user_str] = game_ids
+                global_users.setdefault(user_str, []).extend(game_ids)
+        for game_ids in global_users.values():
+            game_ids.sort(key=lambda game_id: games[game_id]["timestamp"], reverse=True)
+
+        data["global"] = {"users": global_users}
+        data["anonymous_games"] = {
+            anon_id: [store(game) for game in anon_games]
+            for anon_id, anon_games in data["anonymous_games"].items()
+        }
+        data["games"] = games
+
+    def split_into_shards(self, data):
+        """Version 3: Spiele wandern in Server-Shards, DATA_FILE behält nur den Index"""
+        # Das Journal gehört noch zum Format von Version 2
+        self.index.replay(self.apply_legacy_record, data)
+
+        games = data["games"]
+        index = self.default_index()
+        index["users"] = data["global"]["users"]
+        index["achievements"] = data["achievements"]
+        index["daily_challenges"] = data["daily_challenges"]
+
+        for guild_str, guild_data in data["guilds"].items():
+            shard = self.new_shard(guild_str)
+            for user_str, game_ids in guild_data["users"].items():
+                shard.data["users"][user_str] = game_ids
+                for game_id in game_ids:
+                    shard.data["games"][game_id] = games[game_id]
+                    index["meta"][game_id] = self.game_meta(guild_str, games[game_id])
+
+        for anon_id, game_ids in data["anonymous_games"].items():
+            index["anonymous_games"][anon_id] = game_ids
+            for game_id in game_ids:
+                guild_str = str(games[game_id].get("guild_id"))
+                shard = self.shards.get(guild_str) or self.new_shard(guild_str)
+                shard.data["anonymous"].setdefault(anon_id, []).append(game_id)
+                shard.data["games"][game_id] = games[game_id]
+                index["meta"][game_id] = self.game_meta(guild_str, games[game_id])
+
+        for shard in self.shards.values():
+            shard.request_compaction()
+        return index
+
+    def add_game_owners(self, data):
+        """Version 4: die Index-Metadaten kennen den Besitzer jedes Spiels"""
+        meta = data["meta"]
+        for user_str, game_ids in data["users"].items():
+            for game_id in game_ids:
+                meta[game_id][META_USER:] = [int(user_str), None]
+        for anon_id, game_ids in data["anonymous_games"].items():
+            for game_id in game_ids:
+                meta[game_id][META_USER:] = [None, anon_id]
+
+    def reverse_to_append_order(self, data):
+        """Version 5: ID-Listen älteste zuerst, neue Spiele werden nur noch angehängt.
+        Die Server-Shards werden beim ersten Laden in read_shard umgedreht."""
+        for game_ids in [*data["users"].values(), *data["anonymous_games"].values()]:
+            game_ids.reverse()
+        for shard in self.shards.values():
+            self.reverse_shard(shard.data)
+
+    def build_leaderboards(self, data):
+        """Version 6: laufende Bestenlisten-Summen aus den Index-Metadaten aufbauen"""
+        data["leaderboards"] = {"global": {}}
+        for game_ids in data["users"].values():
+            for game_id in game_ids:
+                self.add_to_boards(data["leaderboards"], data["meta"][game_id])
+
+    def build_buckets(self, data):
+        """Version 7: Tages-Buckets der letzten BUCKET_RETENTION_DAYS Tage aus den Index-Metadaten"""
+        data["buckets"] = {}
+        cutoff = (date.today() - timedelta(days=BUCKET_RETENTION_DAYS - 1)).isoformat()
+        for game_ids in data["users"].values():
+            for game_id in game_ids:
+                meta = data["meta"][game_id]
+                if meta[META_TIMESTAMP][:10] >= cutoff:
+                    self.add_to_bucket(data, meta)
+
+    def build_recent_lists(self, data):
+        """Version 8: Liste der letzten Spiele je Shard.
+        Shards auf der Platte bekommen sie beim ersten Laden in read_shard."""
+        for shard in self.shards.values():
+            self.build_recent(shard.data)
+
+    def build_recent(self, shard_data):
+        games = shard_data["games"]
+        shard_data["recent"] = sorted(games, key=lambda game_id: games[game_id]["timestamp"])[-RECENT_GAMES_LIMIT:]
+        shard_data["schema_version"] = self.SCHEMA_VERSION
+
+    def build_summaries(self, data):
+        """Version 9: Zusammenfassungen aller Spiele im Index-Snapshot in Spielreihenfolge.
+        Die Dauer steht nur im Spiel, dafür wird jeder Shard einmal gelesen."""
+        data["summaries"] = {"users": {}, "anonymous": {}}
+        shard_games = {}
+        for game_id, meta in sorted(data["meta"].items(), key=lambda item: item[1][META_TIMESTAMP]):
+            guild_str = meta[META_GUILD]
+            if guild_str not in shard_games:
+                shard = self.shards.get(guild_str) or self.read_shard(guild_str)
+                shard_games[guild_str] = shard.data["games"]
+            self.add_to_summaries(data, meta, shard_games[guild_str][game_id]["duration"])
+
+    def add_to_summaries(self, data, meta: list, duration: float):
+        if meta[META_ANON] is not None:
+            summaries, key = data["summaries"]["anonymous"], meta[META_ANON]
+        else:
+            summaries, key = data["summaries"]["users"], str(meta[META_USER])
+        summaries[key] = add_to_summary(summaries.get(key), meta[META_WON], meta[META_ATTEMPTS], meta[META_HINTS],
+                                        duration, meta[META_TIMESTAMP])
+
+    def add_to_boards(self, boards: dict, meta: list):
+        user_str = str(meta[META_USER])
+        for key in ("global", meta[META_GUILD]):
+            board = boards.setdefault(key, {})
+            board[user_str] = add_to_aggregate(
+                board.get(user_str), meta[META_WON], meta[META_ATTEMPTS], meta[META_HINTS], meta[META_TIMESTAMP]
+            )
+
+    def add_to_bucket(self, data, meta: list):
+        day = meta[META_TIMESTAMP][:10]
+        if day not in data["buckets"]:
+            # Ein neuer Tag beginnt: Buckets außerhalb des längsten Zeitfensters verwerfen
+            cutoff = (date.fromisoformat(day) - timedelta(days=BUCKET_RETENTION_DAYS - 1)).isoformat()
+            for old_day in [d for d in data["buckets"] if d < cutoff]:
+                del data["buckets"][old_day]
+            data["buckets"][day] = {}
+        self.add_to_boards(data["buckets"][day], meta)
+
+    def reverse_shard(self, shard_data):
+        for game_ids in [*shard_data["users"].values(), *shard_data["anonymous"].values()]:
+            game_ids.reverse()
+        shard_data["schema_version"] = self.SCHEMA_VERSION
+
+    def apply_legacy_record(self, data, record: dict):
+        if record["op"] == "achievement":
+            self.apply_index_record(data, record)
+            return
+        game_entry = record["game"]
+        game_id = game_entry["id"]
+        data["games"][game_id] = game_entry
+        if game_entry["anonymous"]:
+            data["anonymous_games"].setdefault(record["anon_id"], []).insert(0, game_id)
+        else:
+            guild_str = str(record["guild_id"])
+            user_str = str(record["user_id"])
+            data["guilds"].setdefault(guild_str, {"users": {}})
+            data["guilds"][guild_str]["users"].setdefault(user_str, []).insert(0, game_id)
+            data["global"]["users"].setdefault(user_str, []).insert(0, game_id)
+
+    def default_index(self):
+        return {"schema_version": self.SCHEMA_VERSION,
+                "meta": {},
+                "users": {},
+                "anonymous_games": {},
+                "achievements": {},
+                "daily_challenges": {},
+                "leaderboards": {"global": {}},
+                "buckets": {},
+                "summaries": {"users": {}, "anonymous": {}}
+                }
+
+    def default_shard(self):
+        return {"schema_version": self.SCHEMA_VERSION, "games": {}, "users": {}, "anonymous": {}, "recent": []}
+
+    def game_meta(self, guild_str: str, game: dict) -> list:
+        return [guild_str, game["timestamp"], game["won"], game["attempts"], game["hints"]]
+
+    # Shards
+
+    def shard_path(self, guild_str: str) -> str:
+        return os.path.join(HISTORY_DIR, f"guild_{guild_str}.json")
+
+    def new_shard(self, guild_str: str) -> JournaledFile:
+        shard = JournaledFile(self.shard_path(guild_str))
+        shard.data = self.default_shard()
+        self.shards[guild_str] = shard
+        return shard
+
+    def read_shard(self, guild_str: str) -> JournaledFile:
+        shard = JournaledFile(self.shard_path(guild_str))
+        shard.data = shard.read_snapshot() or self.default_shard()
+        version = shard.data.get("schema_version", 0)
+        if version < self.SCHEMA_VERSION:
+            if version < 5:
+                # Snapshot aus Version 3/4 noch neueste zuerst, vor dem Journal umdrehen
+                self.reverse_shard(shard.data)
+            self.build_recent(shard.data)
+            shard.request_compaction()
+            self.mark_dirty()
+        shard.replay(self.apply_shard_record)
+        return shard
+
+    def get_shard(self, guild_str: str) -> JournaledFile:
+        """Lädt den Shard eines Servers beim ersten Zugriff"""
+        shard = self.shards.get(guild_str)
+        if shard is None:
+            shard = self.shards[guild_str] = self.read_shard(guild_str)
+        shard.last_used = time.monotonic()
+        self.evict_idle_shards()
+        return shard
+
+    def evict_idle_shards(self):
+        """Entfernt Shards, die länger als SHARD_IDLE_SECONDS nicht benutzt wurden"""
+        now = time.monotonic()
+        if now - self.last_eviction < 60:
+            return
+        self.last_eviction = now
+        for guild_str, shard in list(self.shards.items()):
+            # Ungeschriebene Änderungen bleiben im Speicher, bis sie auf der Platte sind
+            if shard.dirty or shard.writing or shard.pending_lines:
+                continue
+            if now - shard.last_used > SHARD_IDLE_SECONDS:
+                del self.shards[guild_str]
+
+    # Persistenz
+
+    def copy_index(self, data):
+        """Flache Kopie aller Listen - Metadaten und Spieleinträge werden nie verändert"""
+        return {
+            "schema_version": self.SCHEMA_VERSION,
+            "meta": dict(data["meta"]),
+            "users": {user_str: list(games) for user_str, games in data["users"].items()},
+            "anonymous_games": {anon_id: list(games) for anon_id, games in data["anonymous_games"].items()},
+            "achievements": {user_str: dict(a) for user_str, a in data["achievements"].items()},
+            "daily_challenges": dict(data["daily_challenges"]),
+            # Summenzeilen werden bei jedem Spiel ersetzt, nicht verändert
+            "leaderboards": {key: dict(board) for key, board in data["leaderboards"].items()},
+            "buckets": {
+                day: {key: dict(board) for key, board in boards.items()}
+                for day, boards in data["buckets"].items()
+            },
+            "summaries": {kind: dict(summaries) for kind, summaries in data["summaries"].items()}
+        }
+
+    def copy_shard(self, data):
+        return {
+            "schema_version": self.SCHEMA_VERSION,
+            "games": dict(data["games"]),
+            "users": {user_str: list(games) for user_str, games in data["users"].items()},
+            "anonymous": {anon_id: list(games) for anon_id, games in data["anonymous"].items()},
+            "recent": list(data["recent"])
+        }
+
+    def snapshot(self):
+        # Shards vor dem Index schreiben, damit der Index nie auf fehlende Spiele zeigt
+        payload = [(shard, shard.snapshot(self.copy_shard)) for shard in self.shards.values() if shard.dirty]
+        if self.index.dirty:
+            payload.append((self.index, self.index.snapshot(self.copy_index)))
+        return payload
+
+    def write(self, payload):
+        for file, file_payload in payload:
+            file.write(file_payload)
+
+    def restore(self, payload):
+        for file, file_payload in payload:
+            file.restore(file_payload)
+        self.mark_dirty()
+
+    def apply_index_record(self, data, record: dict):
+        if record["op"] == "game":
+            meta = data["meta"][record["id"]] = [*record["meta"], record["user_id"], record["anon_id"]]
+            if "duration" in record:
+                duration = record["duration"]
+            else:
+                # Einträge aus Version 8 ohne Dauer
+                duration = self.get_shard(meta[META_GUILD]).data["games"][record["id"]]["duration"]
+            self.add_to_summaries(data, meta, duration)
+            if record["anon_id"] is not None:
+                data["anonymous_games"].setdefault(record["anon_id"], []).append(record["id"])
+            else:
+                data["users"].setdefault(str(record["user_id"]), []).append(record["id"])
+                self.add_to_boards(data["leaderboards"], meta)
+                self.add_to_bucket(data, meta)
+        elif record["op"] == "achievement":
+            data["achievements"].setdefault(record["user_id"], {})[record["achievement"]] = record["timestamp"]
+
+    def apply_shard_record(self, data, record: dict):
+        if record["op"] == "analysis":
+            # Spieleinträge werden ersetzt, nie verändert - copy_shard kopiert nur das Dict
+            game_entry = data["games"].get(record["id"])
+            if game_entry is not None:
+                data["games"][record["id"]] = {**game_entry, "analysis": record["analysis"]}
+            return
+        game_entry = record["game"]
+        data["games"][game_entry["id"]] = game_entry
+        if record["anon_id"] is not None:
+            data["anonymous"].setdefault(record["anon_id"], []).append(game_entry["id"])
+        else:
+            data["users"].setdefault(str(record["user_id"]), []).append(game_entry["id"])
+        data["recent"].append(game_entry["id"])
+        if len(data["recent"]) > RECENT_GAMES_LIMIT:
+            del data["recent"][0]
+
+    def append(self, file: JournaledFile, apply_record, record: dict):
+        apply_record(file.data, record)
+        file.append(record)
+        self.mark_dirty()
+
+    # Abfragen
+
+    def resolve(self, game_ids: List[str]) -> List[dict]:
+        meta = self.index.data["meta"]
+        return [self.get_shard(meta[game_id][META_GUILD]).data["games"][game_id] for game_id in game_ids]
+
+    def add_game(self, guild_id: int, user_id: Optional[int], anon_id: Optional[str], game_entry: dict):
+        guild_str = str(guild_id)
+        self.append(self.get_shard(guild_str), self.apply_shard_record, {
+            "op": "game",
+            "user_id": user_id,
+            "anon_id": anon_id,
+            "game": game_entry
+        })
+        self.append(self.index, self.apply_index_record, {
+            "op": "game",
+            "id": game_entry["id"],
+            "user_id": user_id,
+            "anon_id": anon_id,
+            "meta": self.game_meta(guild_str, game_entry),
+            "duration": game_entry["duration"]
+        })
+
+    def attach_analysis(self, game_id: str, analysis: List[dict]):
+        meta = self.index.data["meta"].get(game_id)
+        if meta is None:
+            return
+        self.append(self.get_shard(meta[META_GUILD]), self.apply_shard_record, {
+            "op": "analysis",
+            "id": game_id,
+            "analysis": analysis
+        })
+
+    def unlock_achievement(self, user_id: int, achievement_id: str, timestamp: str):
+        self.append(self.index, self.apply_index_record, {
+            "op": "achievement",
+            "user_id": str(user_id),
+            "achievement": achievement_id,
+            "timestamp": timestamp
+        })
+
+    def get_achievements(self, user_id: int) -> Dict[str, str]:
+        return dict(self.index.data["achievements"].get(str(user_id), {}))
+
+    def get_leaderboard(self, scope: str, guild_id: Optional[int] = None) -> List[dict]:
+        board = self.index.data["leaderboards"].get("global" if scope == "global" else str(guild_id), {})
+        leaderboard = [leaderboard_entry(int(user_str), *row) for user_str, row in board.items()]
+        return sorted(leaderboard, key=leaderboard_key)
+
+    def get_leaderboard_entry(self, scope: str, guild_id: Optional[int], user_id: int) -> Optional[dict]:
+        board = self.index.data["leaderboards"].get("global" if scope == "global" else str(guild_id), {})
+        row = board.get(str(user_id))
+        return leaderboard_entry(user_id, *row) if row else None
+
+    def get_window_leaderboard(self, scope: str, guild_id: Optional[int], since_day: str) -> List[dict]:
+        key = "global" if scope == "global" else str(guild_id)
+        rows: Dict[str, list] = {}
+        for day, boards in self.index.data["buckets"].items():
+            if day < since_day:
+                continue
+            for user_str, row in boards.get(key, {}).items():
+                rows.setdefault(user_str, []).append(row)
+        leaderboard = [leaderboard_entry(int(user_str), *merge_aggregates(r)) for user_str, r in rows.items()]
+        return sorted(leaderboard, key=leaderboard_key)
+
+    def get_window_leaderboard_entry(self, scope: str, guild_id: Optional[int], user_id: int,
+                                     since_day: str) -> Optional[dict]:
+        key = "global" if scope == "global" else str(guild_id)
+        user_str = str(user_id)
+        rows = [boards[key][user_str] for day, boards in self.index.data["buckets"].items()
+                if day >= since_day and user_str in boards.get(key, {})]
+        return leaderboard_entry(user_id, *merge_aggregates(rows)) if rows else None
+
+    def _user_list(self, user_id: int, scope: str, guild_id: Optional[int] = None) -> List[str]:
+        if scope == "global":
+            return self.index.data["users"].get(str(user_id), [])
+        return self.get_shard(str(guild_id)).data["users"].get(str(user_id), [])
+
+    def get_user_games(self, user_id: int, scope: str, guild_id: Optional[int] = None,
+                       offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        game_ids = self._user_list(user_id, scope, guild_id)
+        return self.resolve(newest_first(game_ids, offset, limit))
+
+    def count_user_games(self, user_id: int, scope: str, guild_id: Optional[int] = None) -> int:
+        return len(self._user_list(user_id, scope, guild_id))
+
+    def get_anonymous_games(self, anon_id: str, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        game_ids = self.index.data["anonymous_games"].get(anon_id, [])
+        return self.resolve(newest_first(game_ids, offset, limit))
+
+    def count_anonymous_games(self, anon_id: str) -> int:
+        return len(self.index.data["anonymous_games"].get(anon_id, []))
+
+    def get_summary(self, user_id: Optional[int] = None, anon_id: Optional[str] = None) -> Optional[dict]:
+        if anon_id is None:
+            summary = self.index.data["summaries"]["users"].get(str(user_id))
+        else:
+            summary = self.index.data["summaries"]["anonymous"].get(anon_id)
+        return dict(summary) if summary else None
+
+    def _recent_until(self, shard: JournaledFile, anchor: Optional[str]) -> List[str]:
+        """Liste der letzten Spiele bis einschließlich `anchor`, leer wenn es schon herausgefallen ist"""
+        recent = shard.data["recent"]
+        if anchor is None:
+            return recent
+        try:
+            return recent[:recent.index(anchor) + 1]
+        except ValueError:
+            return []
+
+    def get_recent_games(self, guild_id: int, offset: int = 0, limit: Optional[int] = None,
+                         anchor: Optional[str] = None) -> List[tuple]:
+        shard = self.get_shard(str(guild_id))
+        games = shard.data["games"]
+        meta = self.index.data["meta"]
+        recent = []
+        for game_id in newest_first(self._recent_until(shard, anchor), offset, limit):
+            owner = meta[game_id]
+            if owner[META_ANON] is not None:
+                recent.append(("anon", owner[META_ANON], games[game_id]))
+            else:
+                recent.append(("public", owner[META_USER], games[game_id]))
+        return recent
+
+    def count_recent_games(self, guild_id: int, anchor: Optional[str] = None) -> int:
+        return len(self._recent_until(self.get_shard(str(guild_id)), anchor))
+
+    def get_game_owner(self, game_id: str) -> Optional[Tuple[Optional[int], Optional[str]]]:
+        entry = self.index.data["meta"].get(game_id)
+        return (entry[META_USER], entry[META_ANON]) if entry else None
+
+    def get_game(self, game_id: str) -> Optional[dict]:
+        if game_id not in self.index.data["meta"]:
+            return None
+        return self.resolve([game_id])[0]
+
+    def iter_public_games_since(self, since: str) -> Iterator[tuple]:
+        recent = sorted(
+            (entry for entry in self.index.data["meta"].values()
+             if entry[META_USER] is not None and entry[META_TIMESTAMP] >= since),
+            key=lambda entry: entry[META_TIMESTAMP]
+        )
+        for entry in recent:
+            yield entry[META_USER], entry[META_TIMESTAMP], entry[META_WON], entry[META_ATTEMPTS], entry[META_HINTS]
+
+    def iter_games(self) -> Iterator[tuple]:
+        """Liefert (guild_id, user_id, anon_id, Spiel) für alle gespeicherten Spiele, für den SQLite-Import"""
+        guilds = {entry[META_GUILD] for entry in self.index.data["meta"].values()}
+        for guild_str in guilds:
+            # Für den einmaligen Durchlauf keine Shards im Cache behalten
+            shard = self.shards.get(guild_str) or self.read_shard(guild_str)
+            guild_id = None if guild_str == "None" else int(guild_str)
+            games = shard.data["games"]
+            for user_id_str, game_ids in shard.data["users"].items():
+                for game_id in game_ids:
+                    yield guild_id, int(user_id_str), None, games[game_id]
+            for anon_id, game_ids in shard.data["anonymous"].items():
+                for game_id in game_ids:
+                    yield guild_id, None, anon_id, games[game_id]
+
+    def iter_game_stats(self) -> Iterator[tuple]:
+        # Kopie der Metadaten, der Event-Loop darf währenddessen weitere Spiele eintragen
+        by_guild: Dict[str, list] = {}
+        for game_id, entry in list(self.index.data["meta"].items()):
+            by_guild.setdefault(entry[META_GUILD], []).append((game_id, entry))
+        for guild_str, entries in by_guild.items():
+            # Nicht geladene Shards sind vollständig geschrieben und werden nur gelesen, nicht zwischengespeichert
+            shard = self.shards.get(guild_str) or self.read_shard(guild_str)
+            guild_id = None if guild_str == "None" else int(guild_str)
+            games = shard.data["games"]
+            for game_id, entry in entries:
+                yield (game_id, guild_id, entry[META_USER], entry[META_TIMESTAMP], entry[META_WON],
+                       entry[META_ATTEMPTS], entry[META_HINTS], games[game_id]["duration"])
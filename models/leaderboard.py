@@ -0,0 +1,44 @@
+import os
+from dotenv import load_dotenv
+from typing import Optional, List, Dict
+from sortedcontainers import SortedKeyList
+from models.storage import leaderboard_key
+
+# Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE")
+DATA_FILE = os.getenv("DATA_FILE")
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+
+
+class RankedLeaderboard:
+    """Bestenliste eines Bereichs als sortierte Liste nach leaderboard_key.
+
+    Rang eines Spielers und Seiten ab beliebigem Offset kosten O(log n),
+    ein beendetes Spiel ersetzt nur den Eintrag des Spielers.
+    """
+
+    def __init__(self, entries: List[dict]):
+        self.entries = SortedKeyList(entries, key=leaderboard_key)
+        self.by_user: Dict[int, dict] = {entry["user_id"]: entry for entry in entries}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def update(self, entry: dict):
+        old_entry = self.by_user.get(entry["user_id"])
+        if old_entry is not None:
+            self.entries.remove(old_entry)
+        self.entries.add(entry)
+        self.by_user[entry["user_id"]] = entry
+
+    def rank(self, user_id: int) -> Optional[int]:
+        entry = self.by_user.get(user_id)
+        return None if entry is None else self.entries.index(entry) + 1
+
+    def page(self, offset: int, limit: int) -> List[dict]:
+        return list(self.entries.islice(offset, offset + limit))
@@ -0,0 +1,107 @@
+import asyncio
+import atexit
+from abc import ABC, abstractmethod
+import json
+import os
+from dotenv import load_dotenv
+from typing import List, Any
+
+# Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE")
+DATA_FILE = os.getenv("DATA_FILE")
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+FLUSH_INTERVAL = float(os.getenv("FLUSH_INTERVAL", 5)) # - used
+
+
+def write_json_atomic(path: str, data, **kwargs):
+    """Schreibt erst in eine temporäre Datei und ersetzt dann das Original"""
+    tmp_file = f"{path}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(data, f, **kwargs)
+    os.replace(tmp_file, path)
+
+
+class PersistentStore(ABC):
+    """Basis für Stores, die vom WriteBehindPersister geschrieben werden.
+
+    `snapshot()` läuft im Event-Loop und muss billig sein (flache Kopien),
+    `write()` läuft im Executor-Thread und erledigt Serialisierung und Datei-I/O.
+    """
+    dirty = False
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    @abstractmethod
+    def snapshot(self) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def write(self, payload: Any):
+        raise NotImplementedError
+
+    def restore(self, payload: Any):
+        # Fehlgeschlagener Schreibvorgang wird beim nächsten Flush wiederholt
+        self.mark_dirty()
+
+
+class WriteBehindPersister:
+    """Sammelt Änderungen aller Stores und schreibt sie gebündelt im Hintergrund"""
+
+    def __init__(self, interval: float = FLUSH_INTERVAL):
+        self.interval = interval
+        self.stores: List[PersistentStore] = []
+        self.task = None
+        self.flush_lock = asyncio.Lock()
+        atexit.register(self.flush_sync)
+
+    def register(self, *stores: PersistentStore):
+        self.stores.extend(stores)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Speicherfehler: {e}")
+
+    async def flush(self):
+        loop = asyncio.get_running_loop()
+        async with self.flush_lock:
+            for store in self.stores:
+                if not store.dirty:
+                    continue
+                store.dirty = False
+                payload = store.snapshot()
+                try:
+                    await loop.run_in_executor(None, store.write, payload)
+                except Exception as e:
+                    store.restore(payload)
+                    print(f"Speicherfehler ({type(store).__name__}): {e}")
+
+    async def stop(self):
+        """Beendet den Hintergrund-Task und schreibt alle offenen Änderungen"""
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        await self.flush()
+
+    def flush_sync(self):
+        """Letzter synchroner Flush beim Beenden des Prozesses"""
+        for store in self.stores:
+            if store.dirty:
+                store.dirty = False
+                try:
+                    store.write(store.snapshot())
+                except Exception as e:
+                    print(f"Speicherfehler ({type(store).__name__}): {e}")
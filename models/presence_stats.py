@@ -0,0 +1,88 @@
+import os
+from collections import deque
+from dotenv import load_dotenv
+from datetime import datetime, timedelta
+from typing import Optional, Dict
+
+# Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE")
+DATA_FILE = os.getenv("DATA_FILE")
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+
+ACTIVE_WINDOW = timedelta(days=30)
+BEST_PLAYER_WINDOW = timedelta(hours=24)
+
+
+class PresenceStats:
+    """Zahlen für den Bot-Status, nur im Speicher.
+
+    Wird einmal beim Start aus der Historie gefüllt und danach über das
+    Event "game_finished" des WordleCog fortgeschrieben. Abgelaufene Spiele
+    fallen vorne aus den Warteschlangen, ohne die Historie erneut zu lesen.
+    """
+
+    def __init__(self):
+        # (Zeitpunkt, Spieler) aller öffentlichen Spiele der letzten 30 Tage
+        self.active_games = deque()
+        self.active_counts: Dict[int, int] = {}
+        # (Zeitpunkt, Spieler, Versuche, Tipps) gewonnener Spiele der letzten 24 Stunden
+        self.won_games = deque()
+        self.won_sums: Dict[int, list] = {}
+
+    def load(self, history):
+        since = datetime.now() - ACTIVE_WINDOW
+        for user_id, timestamp, won, attempts, hints in history.iter_public_games_since(since.isoformat()):
+            self.record(user_id, datetime.fromisoformat(timestamp), won, attempts, hints)
+
+    async def on_game_finished(self, guild_id: int, user_id: int, game_entry: dict):
+        if game_entry["anonymous"]:
+            return
+        self.record(user_id, datetime.fromisoformat(game_entry["timestamp"]),
+                    game_entry["won"], game_entry["attempts"], game_entry["hints"])
+
+    def record(self, user_id: int, timestamp: datetime, won: bool, attempts: int, hints: int):
+        self.active_games.append((timestamp, user_id))
+        self.active_counts[user_id] = self.active_counts.get(user_id, 0) + 1
+        if won:
+            self.won_games.append((timestamp, user_id, attempts, hints))
+            sums = self.won_sums.setdefault(user_id, [0, 0, 0])
+            sums[0] += 1
+            sums[1] += attempts
+            sums[2] += hints
+
+    def expire(self):
+        now = datetime.now()
+        while self.active_games and self.active_games[0][0] <= now - ACTIVE_WINDOW:
+            _, user_id = self.active_games.popleft()
+            self.active_counts[user_id] -= 1
+            if not self.active_counts[user_id]:
+                del self.active_counts[user_id]
+        while self.won_games and self.won_games[0][0] <= now - BEST_PLAYER_WINDOW:
+            _, user_id, attempts, hints = self.won_games.popleft()
+            sums = self.won_sums[user_id]
+            sums[0] -= 1
+            sums[1] -= attempts
+            sums[2] -= hints
+            if not sums[0]:
+                del self.won_sums[user_id]
+
+    def active_players(self) -> int:
+        self.expire()
+        return len(self.active_counts)
+
+    def best_player(self) -> Optional[tuple]:
+        """Gibt (user_id, Siege, Ø-Versuche, Ø-Tipps) des besten Spielers der letzten 24 Stunden zurück"""
+        self.expire()
+        if not self.won_sums:
+            return None
+        user_id, (wins, attempts, hints) = min(
+            self.won_sums.items(),
+            # Meiste Siege, dann wenigste Versuche, dann wenigste Tipps
+            key=lambda item: (-item[1][0], item[1][1] / item[1][0], item[1][2] / item[1][0])
+        )
+        return user_id, wins, attempts / wins, hints / wins
@@ -2,6 +2,7 @@ import json
 import os
 from dotenv import load_dotenv
 from typing import Optional, List, Dict, Any
+from models.persistence import PersistentStore, write_json_atomic
 
 # Worde Variablen. When use one do a # behind the variable and write # - used
 load_dotenv()
@@ -14,24 +15,47 @@ SETTINGS_FILE = os.getenv("SETTINGS_FILE")
 DAILY_FILE = os.getenv("DAILY_FILE")
 
 
-class ServerConfig:
+class ServerConfig(PersistentStore):
+    """Einstellungen je Server: {guild_id: {"channel": Channel-ID, "word_list": Name der Wortliste}}"""
+
     def __init__(self):
         self.config = self.load_config()
     
     def load_config(self):
         try:
             with open(CONFIG_FILE) as f:
-                return json.load(f)
+                config = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
+        # Ältere Dateien speichern je Server nur die Channel-ID
+        return {guild_str: entry if isinstance(entry, dict) else {"channel": entry}
+                for guild_str, entry in config.items()}
     
     def save_config(self):
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(self.config, f, indent=2)
+        """Markiert die Konfiguration zum Speichern, geschrieben wird im Hintergrund"""
+        self.mark_dirty()
     
-    def set_wordle_channel(self, guild_id: int, channel_id: int):
-        self.config[str(guild_id)] = channel_id
+    def snapshot(self):
+        # Einträge werden bei jeder Änderung ersetzt, nicht verändert
+        return dict(self.config)
+    
+    def write(self, payload):
+        write_json_atomic(CONFIG_FILE, payload, indent=2)
+    
+    def update(self, guild_id: int, **values):
+        guild_str = str(guild_id)
+        self.config[guild_str] = {**self.config.get(guild_str, {}), **values}
         self.save_config()
     
+    def set_wordle_channel(self, guild_id: int, channel_id: int):
+        self.update(guild_id, channel=channel_id)
+    
     def get_wordle_channel(self, guild_id: int) -> Optional[int]:
-        return self.config.get(str(guild_id))
\ No newline at end of file
+        return self.config.get(str(guild_id), {}).get("channel")
+    
+    def set_word_list(self, guild_id: int, name: str):
+        self.update(guild_id, word_list=name)
+    
+    def get_word_list(self, guild_id: Optional[int]) -> Optional[str]:
+        """Name der Wortliste des Servers, None für die Standardliste WORDS_FILE"""
+        return self.config.get(str(guild_id), {}).get("word_list")
\ No newline at end of file
@@ -0,0 +1,168 @@
+import asyncio
+import multiprocessing
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from dotenv import load_dotenv
+from typing import Optional, List, Tuple, Dict
+from models.feedback_matrix import FeedbackMatrix, score, encode
+from utils.allowed_words import get_allowed_words
+from utils.word_bank import get_word_bank
+
+# Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE")
+DATA_FILE = os.getenv("DATA_FILE")
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+SOLVER_WORKERS = int(os.getenv("SOLVER_WORKERS", 1)) # - used
+
+PATTERNS = 243
+# Rateversuche je Block, begrenzt den Speicher der Muster-Zählung
+CHUNK_ROWS = 2048
+
+# Je Worker-Prozess einmal geöffnete Matrizen
+_worker_matrices: Dict[str, np.ndarray] = {}
+
+
+def rank_guesses(path: str, candidates: np.ndarray, candidate_guesses: np.ndarray,
+                 top: int) -> List[Tuple[int, float]]:
+    """Läuft im Worker-Prozess: die `top` Rateversuche mit der höchsten erwarteten Information.
+
+    Für jeden Rateversuch wird gezählt, wie sich die Kandidaten auf die 243
+    Muster verteilen, die Entropie dieser Verteilung ist der erwartete Gewinn in Bit.
+    Rateversuche, die selbst noch Lösung sein können, bekommen bei Gleichstand den Vorzug.
+    """
+    if path not in _worker_matrices:
+        _worker_matrices[path] = np.load(path, mmap_mode="r")
+    matrix = _worker_matrices[path]
+
+    entropies = np.empty(len(matrix), dtype=np.float64)
+    for start in range(0, len(matrix), CHUNK_ROWS):
+        patterns = np.asarray(matrix[start:start + CHUNK_ROWS, candidates], dtype=np.intp)
+        rows = len(patterns)
+        # Ein bincount für den ganzen Block: Zeile r zählt in die Fächer r*243 bis r*243+242
+        counts = np.bincount((patterns + PATTERNS * np.arange(rows)[:, None]).ravel(),
+                             minlength=rows * PATTERNS).reshape(rows, PATTERNS)
+        p = counts / len(candidates)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entropies[start:start + rows] = -np.where(p > 0, p * np.log2(p), 0).sum(axis=1)
+
+    bonus = np.zeros(len(matrix))
+    bonus[candidate_guesses] = 1e-6
+    best = np.argsort(-(entropies + bonus), kind="stable")[:top]
+    return [(int(index), float(entropies[index])) for index in best]
+
+
+def all_answers(matrix: FeedbackMatrix) -> int:
+    return (1 << len(matrix.answers)) - 1
+
+
+def candidate_mask(matrix: FeedbackMatrix, guess: str, pattern: int) -> int:
+    """Lösungen, die zu Rateversuch und Muster passen, als Bitmaske über die Lösungsindizes.
+    Schnittmengen und Anzahlen sind danach nur noch & und bit_count()."""
+    if guess in matrix.guess_index:
+        hits = matrix.matrix[matrix.guess_index[guess]] == pattern
+    else:
+        hits = np.array([score(guess, answer) == pattern for answer in matrix.answers], dtype=bool)
+    return int.from_bytes(np.packbits(hits, bitorder="little").tobytes(), "little")
+
+
+def mask_indices(matrix: FeedbackMatrix, mask: int) -> np.ndarray:
+    size = len(matrix.answers)
+    bits = np.unpackbits(np.frombuffer(mask.to_bytes((size + 7) // 8, "little"), dtype=np.uint8), bitorder="little")
+    return np.flatnonzero(bits[:size])
+
+
+class SolverHints:
+    """Solver-Tipps: beste nächste Rateversuche nach erwarteter Information.
+
+    Rateversuche sind das erlaubte Wörterbuch, Lösungen die aktuelle Version der
+    Wortliste des Spiels. Die Matrix je Liste wird beim ersten Tipp in einem Thread
+    kompiliert bzw. geöffnet, die Bewertung läuft im Prozess-Pool und blockiert
+    den Event-Loop nie. Nach dem Neuladen der Wortlisten leert invalidate() alles.
+    """
+
+    def __init__(self, workers: int = SOLVER_WORKERS):
+        # Kein fork aus dem laufenden Bot (Threads, Event-Loop, offene Sockets): die Worker
+        # starten frisch und laden die Matrix selbst per Memory-Map
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method))
+        self.matrices: Dict[str, FeedbackMatrix] = {}
+        self.matrix_lock = asyncio.Lock()
+        # Der erste Rateversuch hängt von keinem Spiel ab und wird je Liste nur einmal berechnet
+        self.openings: Dict[str, List[Tuple[str, float]]] = {}
+
+    async def get_matrix(self, name: Optional[str] = None) -> FeedbackMatrix:
+        word_list = get_word_bank().get(name)
+        async with self.matrix_lock:
+            if word_list.name not in self.matrices:
+                # Ohne Wörterbuch sind alle Wortlisten die Rateversuche
+                allowed = get_allowed_words() or get_word_bank().all_words()
+                guesses = sorted(allowed | word_list.word_set)
+                self.matrices[word_list.name] = await asyncio.get_running_loop().run_in_executor(
+                    None, FeedbackMatrix, guesses, list(word_list.words), f"solver_{word_list.name}"
+                )
+            return self.matrices[word_list.name]
+
+    def invalidate(self):
+        self.matrices = {}
+        self.openings = {}
+
+    def filter_candidates(self, matrix: FeedbackMatrix, attempts: List[tuple]) -> np.ndarray:
+        """Indizes aller Lösungen, die zu den bisherigen Versuchen passen"""
+        mask = all_answers(matrix)
+        for guess, result in attempts:
+            mask &= candidate_mask(matrix, guess, encode(result))
+        return mask_indices(matrix, mask)
+
+    async def rank(self, matrix: FeedbackMatrix, candidates: np.ndarray, top: int) -> List[Tuple[str, float]]:
+        """Die `top` besten Rateversuche für die Kandidaten als [(Wort, Bit)]"""
+        if len(candidates) <= 2:
+            # Bei höchstens zwei Möglichkeiten ist Raten einer Lösung immer am besten
+            return [(matrix.answers[a], float(len(candidates) - 1)) for a in candidates]
+
+        candidate_guesses = np.array([matrix.guess_index[matrix.answers[a]] for a in candidates], dtype=np.intp)
+        ranked = await asyncio.get_running_loop().run_in_executor(
+            self.pool, rank_guesses, matrix.path, candidates, candidate_guesses, top
+        )
+        return [(matrix.guesses[index], entropy) for index, entropy in ranked]
+
+    async def suggest(self, attempts: List[tuple], name: Optional[str] = None,
+                      top: int = 3) -> Tuple[List[Tuple[str, float]], int]:
+        """Gibt ([(Wort, Bit)], Anzahl verbleibender Lösungen) für die Wortliste `name` zurück"""
+        matrix = await self.get_matrix(name)
+        if not attempts:
+            key = get_word_bank().get(name).name
+            if key not in self.openings:
+                self.openings[key] = await self.rank(matrix, np.arange(len(matrix.answers)), top)
+            return self.openings[key], len(matrix.answers)
+
+        candidates = self.filter_candidates(matrix, attempts)
+        return await self.rank(matrix, candidates, top), len(candidates)
+
+    async def analyze(self, secret: str, attempts: List[tuple], name: Optional[str] = None) -> List[dict]:
+        """Nachanalyse eines beendeten Spiels, ein Eintrag je Versuch.
+
+        "remaining": mögliche Lösungen nach dem Versuch,
+        "best"/"optimal": Vorschlag des Solvers an dieser Stelle und wie viele er übrig gelassen hätte.
+        """
+        matrix = await self.get_matrix(name)
+        mask = all_answers(matrix)
+        steps = []
+        for i, (guess, result) in enumerate(attempts):
+            if i == 0:
+                best = (await self.suggest([], name))[0]
+            else:
+                best = await self.rank(matrix, mask_indices(matrix, mask), 1)
+            best_word = best[0][0] if best else guess
+            optimal = (mask & candidate_mask(matrix, best_word, score(best_word, secret))).bit_count()
+            mask &= candidate_mask(matrix, guess, encode(result))
+            steps.append({"remaining": mask.bit_count(), "best": best_word, "optimal": optimal})
+        return steps
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,427 @@
+import json
+import sqlite3
+import threading
+import os
+from dotenv import load_dotenv
+from datetime import date, timedelta
+from typing import Optional, List, Dict, Tuple, Iterator
+from models.storage import HistoryStorage, leaderboard_entry, add_to_summary, BUCKET_RETENTION_DAYS, RECENT_GAMES_LIMIT
+from models.json_storage import JsonHistoryStorage
+
+# Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE")
+DATA_FILE = os.getenv("DATA_FILE") # - used
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+JOURNAL_FILE = os.getenv("JOURNAL_FILE", f"{DATA_FILE}.journal") # - used
+DATABASE_FILE = os.getenv("DATABASE_FILE", "wordle_data.db") # - used
+
+
+class SqliteHistoryStorage(HistoryStorage):
+    """SQLite-Datenbank (WAL) mit Indizes auf Spieler, Server, Anonym-ID, Zeit und Spiel-ID.
+
+    Schreibzugriffe laufen sofort in eine offene Transaktion, das Commit
+    übernimmt der WriteBehindPersister im Executor-Thread. Ohne fsync (WAL,
+    synchronous=NORMAL) ist es nur ein Anhängen ans WAL. Checkpoints und große
+    Lesezugriffe laufen auf einer eigenen Verbindung mit eigenem Lock, der
+    Event-Loop wartet nie auf sie.
+    """
+
+    SCHEMA_VERSION = 5
+    # Version -> SQL, das eine Datenbank der Vorgängerversion auf diese Version hebt
+    MIGRATIONS = {
+        1: """
+            CREATE TABLE IF NOT EXISTS games (
+                id TEXT PRIMARY KEY,
+                guild_id INTEGER,
+                user_id INTEGER,
+                anon_id TEXT,
+                timestamp TEXT NOT NULL,
+                won INTEGER NOT NULL,
+                word TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                hints INTEGER NOT NULL,
+                duration REAL NOT NULL,
+                guesses TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_games_user ON games(user_id, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_games_user_guild ON games(user_id, guild_id, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_games_guild ON games(guild_id, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_games_anon ON games(anon_id, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_games_timestamp ON games(timestamp);
+            CREATE TABLE IF NOT EXISTS achievements (
+                user_id INTEGER NOT NULL,
+                achievement TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                PRIMARY KEY (user_id, achievement)
+            );
+            """,
+        # Laufende Summen je Spieler, guild_id 0 steht für die globale Bestenliste
+        2: """
+            CREATE TABLE IF NOT EXISTS leaderboard (
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                total INTEGER NOT NULL,
+                attempt_sum INTEGER NOT NULL,
+                hint_sum INTEGER NOT NULL,
+                last_played TEXT NOT NULL,
+                PRIMARY KEY (guild_id, user_id)
+            );
+            INSERT INTO leaderboard
+                SELECT guild_id, user_id, SUM(won), COUNT(*), SUM(attempts), SUM(hints), MAX(timestamp)
+                FROM games WHERE user_id IS NOT NULL AND guild_id IS NOT NULL GROUP BY guild_id, user_id;
+            INSERT INTO leaderboard
+                SELECT 0, user_id, SUM(won), COUNT(*), SUM(attempts), SUM(hints), MAX(timestamp)
+                FROM games WHERE user_id IS NOT NULL GROUP BY user_id;
+            """,
+        # Dieselben Summen je Tag für die Zeitfenster-Bestenlisten
+        3: """
+            CREATE TABLE IF NOT EXISTS daily_leaderboard (
+                day TEXT NOT NULL,
+                guild_id INTEGER NOT NULL,
+                user_id INTEGER NOT NULL,
+                wins INTEGER NOT NULL,
+                total INTEGER NOT NULL,
+                attempt_sum INTEGER NOT NULL,
+                hint_sum INTEGER NOT NULL,
+                last_played TEXT NOT NULL,
+                PRIMARY KEY (day, guild_id, user_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_daily_leaderboard_guild ON daily_leaderboard(guild_id, day);
+            INSERT INTO daily_leaderboard
+                SELECT substr(timestamp, 1, 10), guild_id, user_id, SUM(won), COUNT(*), SUM(attempts), SUM(hints), MAX(timestamp)
+                FROM games WHERE user_id IS NOT NULL AND guild_id IS NOT NULL
+                    AND timestamp >= date('now', 'localtime', '-31 days')
+                GROUP BY substr(timestamp, 1, 10), guild_id, user_id;
+            INSERT INTO daily_leaderboard
+                SELECT substr(timestamp, 1, 10), 0, user_id, SUM(won), COUNT(*), SUM(attempts), SUM(hints), MAX(timestamp)
+                FROM games WHERE user_id IS NOT NULL AND timestamp >= date('now', 'localtime', '-31 days')
+                GROUP BY substr(timestamp, 1, 10), user_id;
+            """,
+        # Statistik-Zusammenfassung je Spieler ("user:<id>") und Anonym-ID ("anon:<id>") als JSON,
+        # befüllt von build_summaries, da Serien sich nicht in SQL zählen lassen
+        4: """
+            CREATE TABLE IF NOT EXISTS summaries (
+                owner TEXT PRIMARY KEY,
+                summary TEXT NOT NULL
+            );
+            """,
+        # Nachanalyse je Spiel als JSON, wird nach dem Spiel nachgetragen
+        5: """
+            ALTER TABLE games ADD COLUMN analysis TEXT;
+            """
+    }
+    GAME_COLUMNS = "id, guild_id, user_id, anon_id, timestamp, won, word, attempts, hints, duration, guesses, analysis"
+
+    def __init__(self, path: str = DATABASE_FILE):
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        # Kein automatischer Checkpoint im Commit, write() erledigt ihn auf der Hintergrund-Verbindung
+        self.db.execute("PRAGMA wal_autocheckpoint=0")
+        self.migrate()
+        self.import_json_history()
+        self.background_lock = threading.Lock()
+        self.background = sqlite3.connect(path, check_same_thread=False)
+        self.background.row_factory = sqlite3.Row
+
+    def migrate(self):
+        """Führt nur die Migrationen aus, die laut PRAGMA user_version noch fehlen"""
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        for target in range(version + 1, self.SCHEMA_VERSION + 1):
+            self.db.executescript(self.MIGRATIONS[target])
+            if target == 4:
+                self.build_summaries()
+            self.db.execute(f"PRAGMA user_version = {target}")
+            print(f"Datenbank migriert auf Version {target}")
+
+    def build_summaries(self):
+        summaries = {}
+        rows = self.db.execute(
+            "SELECT user_id, anon_id, won, attempts, hints, duration, timestamp FROM games ORDER BY timestamp"
+        )
+        for row in rows:
+            owner = self._summary_owner(row["user_id"], row["anon_id"])
+            summaries[owner] = add_to_summary(summaries.get(owner), bool(row["won"]), row["attempts"],
+                                              row["hints"], row["duration"], row["timestamp"])
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?)",
+                [(owner, json.dumps(summary, separators=(",", ":"))) for owner, summary in summaries.items()]
+            )
+
+    def import_json_history(self):
+        """Übernimmt einmalig eine vorhandene JSON-Historie in eine leere Datenbank"""
+        if self.db.execute("SELECT 1 FROM games LIMIT 1").fetchone():
+            return
+        if not os.path.exists(DATA_FILE) and not os.path.exists(JOURNAL_FILE):
+            return
+
+        json_storage = JsonHistoryStorage()
+        # In Spielreihenfolge einfügen, sonst stimmen die Serien der Zusammenfassungen nicht
+        games = sorted(json_storage.iter_games(), key=lambda entry: entry[3]["timestamp"])
+        with self.db:
+            for guild_id, user_id, anon_id, game in games:
+                self._insert_game(guild_id, user_id, anon_id, game)
+            for user_id_str, achievements in json_storage.index.data["achievements"].items():
+                for achievement_id, timestamp in achievements.items():
+                    self.db.execute(
+                        "INSERT OR IGNORE INTO achievements VALUES (?, ?, ?)",
+                        (int(user_id_str), achievement_id, timestamp)
+                    )
+
+    def snapshot(self):
+        return None
+
+    def write(self, payload):
+        cutoff = (date.today() - timedelta(days=BUCKET_RETENTION_DAYS - 1)).isoformat()
+        with self.lock:
+            # Tages-Buckets außerhalb des längsten Zeitfensters verwerfen
+            self.db.execute("DELETE FROM daily_leaderboard WHERE day < ?", (cutoff,))
+            self.db.commit()
+        # WAL-Seiten in die Datenbank zurückschreiben, ohne self.lock zu halten
+        with self.background_lock:
+            self.background.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def _fetchall(self, sql: str, params: tuple = ()) -> list:
+        with self.lock:
+            return self.db.execute(sql, params).fetchall()
+
+    def _fetchone(self, sql: str, params: tuple = ()):
+        with self.lock:
+            return self.db.execute(sql, params).fetchone()
+
+    def _insert_game(self, guild_id, user_id, anon_id, game: dict):
+        """Spiel, Zusammenfassung und Bestenlisten in einem Savepoint - schlägt ein Schritt fehl,
+        bleibt nichts von dem Spiel in der offenen Transaktion zurück"""
+        if not self.db.in_transaction:
+            self.db.execute("BEGIN")
+        self.db.execute("SAVEPOINT insert_game")
+        try:
+            self._insert_game_rows(guild_id, user_id, anon_id, game)
+        except BaseException:
+            self.db.execute("ROLLBACK TO insert_game")
+            self.db.execute("RELEASE insert_game")
+            raise
+        self.db.execute("RELEASE insert_game")
+
+    def _insert_game_rows(self, guild_id, user_id, anon_id, game: dict):
+        inserted = self.db.execute(
+            f"INSERT OR IGNORE INTO games ({self.GAME_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (game["id"], guild_id, user_id, anon_id, game["timestamp"], int(game["won"]), game["word"],
+             game["attempts"], game["hints"], game["duration"],
+             json.dumps(game["guesses"], separators=(",", ":")),
+             json.dumps(game["analysis"], separators=(",", ":")) if "analysis" in game else None)
+        ).rowcount
+        if not inserted:
+            return
+        owner = self._summary_owner(user_id, anon_id)
+        summary = add_to_summary(self._get_summary(owner), game["won"], game["attempts"], game["hints"],
+                                 game["duration"], game["timestamp"])
+        self.db.execute("INSERT OR REPLACE INTO summaries VALUES (?, ?)",
+                        (owner, json.dumps(summary, separators=(",", ":"))))
+        if user_id is None:
+            return
+        values = (user_id, int(game["won"]), game["attempts"], game["hints"], game["timestamp"])
+        # Spiele in DMs haben keinen Server und zählen nur global
+        boards = (0,) if guild_id is None else (0, guild_id)
+        for board_id in boards:
+            self._upsert_aggregate("leaderboard", "guild_id", (board_id, *values))
+            self._upsert_aggregate("daily_leaderboard", "day, guild_id", (game["timestamp"][:10], board_id, *values))
+
+    def _upsert_aggregate(self, table: str, board_columns: str, values: tuple):
+        placeholders = ", ".join("?" * (len(values) - 4))
+        self.db.execute(
+            f"""INSERT INTO {table} VALUES ({placeholders}, ?, 1, ?, ?, ?)
+                ON CONFLICT ({board_columns}, user_id) DO UPDATE SET
+                    wins = wins + excluded.wins,
+                    total = total + 1,
+                    attempt_sum = attempt_sum + excluded.attempt_sum,
+                    hint_sum = hint_sum + excluded.hint_sum,
+                    last_played = MAX(last_played, excluded.last_played)""",
+            values
+        )
+
+    def _summary_owner(self, user_id: Optional[int], anon_id: Optional[str]) -> str:
+        return f"anon:{anon_id}" if anon_id is not None else f"user:{user_id}"
+
+    def _get_summary(self, owner: str) -> Optional[dict]:
+        row = self.db.execute("SELECT summary FROM summaries WHERE owner = ?", (owner,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _row_to_game(self, row) -> dict:
+        game = {
+            "id": row["id"],
+            "timestamp": row["timestamp"],
+            "won": bool(row["won"]),
+            "word": row["word"],
+            "attempts": row["attempts"],
+            "hints": row["hints"],
+            "guesses": json.loads(row["guesses"]),
+            "duration": row["duration"],
+            "anonymous": row["anon_id"] is not None,
+            "guild_id": row["guild_id"]
+        }
+        if row["analysis"] is not None:
+            game["analysis"] = json.loads(row["analysis"])
+        return game
+
+    def _user_filter(self, user_id: int, scope: str, guild_id: Optional[int]):
+        if scope == "global":
+            return "user_id = ?", (user_id,)
+        return "user_id = ? AND guild_id = ?", (user_id, guild_id)
+
+    def add_game(self, guild_id: int, user_id: Optional[int], anon_id: Optional[str], game_entry: dict):
+        with self.lock:
+            self._insert_game(guild_id, user_id, anon_id, game_entry)
+        self.mark_dirty()
+
+    def attach_analysis(self, game_id: str, analysis: List[dict]):
+        with self.lock:
+            self.db.execute("UPDATE games SET analysis = ? WHERE id = ?",
+                            (json.dumps(analysis, separators=(",", ":")), game_id))
+        self.mark_dirty()
+
+    def unlock_achievement(self, user_id: int, achievement_id: str, timestamp: str):
+        with self.lock:
+            self.db.execute(
+                "INSERT OR IGNORE INTO achievements VALUES (?, ?, ?)",
+                (user_id, achievement_id, timestamp)
+            )
+        self.mark_dirty()
+
+    def get_achievements(self, user_id: int) -> Dict[str, str]:
+        rows = self._fetchall(
+            "SELECT achievement, timestamp FROM achievements WHERE user_id = ?", (user_id,)
+        )
+        return {row["achievement"]: row["timestamp"] for row in rows}
+
+    def get_leaderboard(self, scope: str, guild_id: Optional[int] = None) -> List[dict]:
+        rows = self._fetchall(
+            """SELECT user_id, wins, total, attempt_sum, hint_sum, last_played FROM leaderboard
+               WHERE guild_id = ?
+               ORDER BY wins DESC, total DESC, CAST(attempt_sum AS REAL) / total ASC, user_id ASC""",
+            (0 if scope == "global" else guild_id,)
+        )
+        return [leaderboard_entry(*row) for row in rows]
+
+    def get_leaderboard_entry(self, scope: str, guild_id: Optional[int], user_id: int) -> Optional[dict]:
+        row = self._fetchone(
+            """SELECT user_id, wins, total, attempt_sum, hint_sum, last_played FROM leaderboard
+               WHERE guild_id = ? AND user_id = ?""",
+            (0 if scope == "global" else guild_id, user_id)
+        )
+        return leaderboard_entry(*row) if row else None
+
+    def get_window_leaderboard(self, scope: str, guild_id: Optional[int], since_day: str) -> List[dict]:
+        rows = self._fetchall(
+            """SELECT user_id, SUM(wins), SUM(total), SUM(attempt_sum), SUM(hint_sum), MAX(last_played)
+               FROM daily_leaderboard
+               WHERE guild_id = ? AND day >= ?
+               GROUP BY user_id
+               ORDER BY SUM(wins) DESC, SUM(total) DESC, CAST(SUM(attempt_sum) AS REAL) / SUM(total) ASC, user_id ASC""",
+            (0 if scope == "global" else guild_id, since_day)
+        )
+        return [leaderboard_entry(*row) for row in rows]
+
+    def get_window_leaderboard_entry(self, scope: str, guild_id: Optional[int], user_id: int,
+                                     since_day: str) -> Optional[dict]:
+        row = self._fetchone(
+            """SELECT user_id, SUM(wins), SUM(total), SUM(attempt_sum), SUM(hint_sum), MAX(last_played)
+               FROM daily_leaderboard
+               WHERE guild_id = ? AND user_id = ? AND day >= ?
+               GROUP BY user_id""",
+            (0 if scope == "global" else guild_id, user_id, since_day)
+        )
+        return leaderboard_entry(*row) if row else None
+
+    def get_user_games(self, user_id: int, scope: str, guild_id: Optional[int] = None,
+                       offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        where, params = self._user_filter(user_id, scope, guild_id)
+        rows = self._fetchall(
+            f"SELECT * FROM games WHERE {where} ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+            (*params, -1 if limit is None else limit, offset)
+        )
+        return [self._row_to_game(row) for row in rows]
+
+    def count_user_games(self, user_id: int, scope: str, guild_id: Optional[int] = None) -> int:
+        where, params = self._user_filter(user_id, scope, guild_id)
+        return self._fetchone(f"SELECT COUNT(*) FROM games WHERE {where}", params)[0]
+
+    def get_anonymous_games(self, anon_id: str, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        rows = self._fetchall(
+            "SELECT * FROM games WHERE anon_id = ? ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+            (anon_id, -1 if limit is None else limit, offset)
+        )
+        return [self._row_to_game(row) for row in rows]
+
+    def count_anonymous_games(self, anon_id: str) -> int:
+        return self._fetchone("SELECT COUNT(*) FROM games WHERE anon_id = ?", (anon_id,))[0]
+
+    def get_summary(self, user_id: Optional[int] = None, anon_id: Optional[str] = None) -> Optional[dict]:
+        with self.lock:
+            return self._get_summary(self._summary_owner(user_id, anon_id))
+
+    def _recent_filter(self, guild_id: int, anchor: Optional[str]):
+        if anchor is None:
+            return "guild_id = ?", (guild_id,)
+        # Fehlt der Anker, ist der Vergleich NULL und die Liste leer
+        return "guild_id = ? AND (timestamp, id) <= (SELECT timestamp, id FROM games WHERE id = ?)", (guild_id, anchor)
+
+    def get_recent_games(self, guild_id: int, offset: int = 0, limit: Optional[int] = None,
+                         anchor: Optional[str] = None) -> List[tuple]:
+        # Über idx_games_guild liest SQLite nur die angefragte Seite
+        limit = RECENT_GAMES_LIMIT - offset if limit is None else min(limit, RECENT_GAMES_LIMIT - offset)
+        where, params = self._recent_filter(guild_id, anchor)
+        rows = self._fetchall(
+            f"SELECT {self.GAME_COLUMNS} FROM games WHERE {where} ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+            (*params, max(limit, 0), offset)
+        )
+        return [
+            ("anon", row["anon_id"], self._row_to_game(row)) if row["anon_id"] is not None
+            else ("public", row["user_id"], self._row_to_game(row))
+            for row in rows
+        ]
+
+    def count_recent_games(self, guild_id: int, anchor: Optional[str] = None) -> int:
+        where, params = self._recent_filter(guild_id, anchor)
+        return self._fetchone(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM games WHERE {where} LIMIT ?)",
+            (*params, RECENT_GAMES_LIMIT)
+        )[0]
+
+    def get_game_owner(self, game_id: str) -> Optional[Tuple[Optional[int], Optional[str]]]:
+        row = self._fetchone("SELECT user_id, anon_id FROM games WHERE id = ?", (game_id,))
+        return (row["user_id"], row["anon_id"]) if row else None
+
+    def get_game(self, game_id: str) -> Optional[dict]:
+        row = self._fetchone(f"SELECT {self.GAME_COLUMNS} FROM games WHERE id = ?", (game_id,))
+        return self._row_to_game(row) if row else None
+
+    def iter_public_games_since(self, since: str) -> Iterator[tuple]:
+        rows = self._fetchall(
+            """SELECT user_id, timestamp, won, attempts, hints FROM games
+               WHERE user_id IS NOT NULL AND timestamp >= ? ORDER BY timestamp""",
+            (since,)
+        )
+        for row in rows:
+            yield row["user_id"], row["timestamp"], bool(row["won"]), row["attempts"], row["hints"]
+
+    def iter_game_stats(self) -> Iterator[tuple]:
+        # Offene Spiele kurz committen, damit die Hintergrund-Verbindung sie sieht, dann ohne self.lock lesen
+        with self.lock:
+            self.db.commit()
+        with self.background_lock:
+            rows = self.background.execute(
+                "SELECT id, guild_id, user_id, timestamp, won, attempts, hints, duration FROM games"
+            ).fetchall()
+        for row in rows:
+            yield (row["id"], row["guild_id"], row["user_id"], row["timestamp"], bool(row["won"]),
+                   row["attempts"], row["hints"], row["duration"])
@@ -0,0 +1,320 @@
+import json
+import time
+import os
+from abc import abstractmethod
+from dotenv import load_dotenv
+from datetime import datetime, date, timedelta
+from typing import Optional, List, Dict, Tuple, Callable, Iterator
+from models.persistence import PersistentStore, write_json_atomic
+
+# Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE")
+DATA_FILE = os.getenv("DATA_FILE")
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+COMPACT_EVERY = int(os.getenv("COMPACT_EVERY", 500)) # - used
+RECENT_GAMES_LIMIT = int(os.getenv("RECENT_GAMES_LIMIT", 500)) # - used
+
+
+# Laufende Summen je Spieler und Bereich: [Siege, Spiele, Summe Versuche, Summe Tipps, Zuletzt gespielt]
+AGG_WINS, AGG_TOTAL, AGG_ATTEMPTS, AGG_HINTS, AGG_LAST_PLAYED = range(5)
+
+
+# Zeitfenster der Bestenlisten in Tagen, die Tages-Buckets werden so lange aufbewahrt
+LEADERBOARD_WINDOWS = {"daily": 1, "weekly": 7, "monthly": 30}
+BUCKET_RETENTION_DAYS = max(LEADERBOARD_WINDOWS.values())
+
+
+def window_start(window: str, today: Optional[date] = None) -> str:
+    """Erster Tag (ISO) eines Zeitfensters, der heutige Tag zählt mit"""
+    today = today or date.today()
+    return (today - timedelta(days=LEADERBOARD_WINDOWS[window] - 1)).isoformat()
+
+
+def add_to_aggregate(row: Optional[list], won: bool, attempts: int, hints: int, timestamp: str) -> list:
+    """Gibt eine neue Zeile zurück, bestehende Zeilen werden nie verändert"""
+    if row is None:
+        return [int(won), 1, attempts, hints, timestamp]
+    return [row[AGG_WINS] + int(won), row[AGG_TOTAL] + 1, row[AGG_ATTEMPTS] + attempts,
+            row[AGG_HINTS] + hints, max(row[AGG_LAST_PLAYED], timestamp)]
+
+
+def leaderboard_entry(user_id: int, wins: int, total: int, attempt_sum: int, hint_sum: int, last_played: str) -> dict:
+    return {
+        "user_id": user_id,
+        "wins": wins,
+        "total": total,
+        "avg_attempts": attempt_sum / total,
+        "avg_hints": hint_sum / total,
+        "win_rate": wins / total,
+        "last_played": last_played
+    }
+
+
+def merge_aggregates(rows: List[list]) -> list:
+    return [sum(row[AGG_WINS] for row in rows), sum(row[AGG_TOTAL] for row in rows),
+            sum(row[AGG_ATTEMPTS] for row in rows), sum(row[AGG_HINTS] for row in rows),
+            max(row[AGG_LAST_PLAYED] for row in rows)]
+
+
+def leaderboard_key(entry: dict) -> tuple:
+    """Meiste Siege, dann meiste Spiele, dann wenigste Versuche - die user_id macht die Reihenfolge eindeutig"""
+    return -entry["wins"], -entry["total"], entry["avg_attempts"], entry["user_id"]
+
+
+def add_to_summary(summary: Optional[dict], won: bool, attempts: int, hints: int, duration: float,
+                   timestamp: str) -> dict:
+    """Zusammenfassung eines Spielers nach einem weiteren Spiel, Spiele kommen in Spielreihenfolge.
+    Gibt wie add_to_aggregate eine neue Zusammenfassung zurück."""
+    if summary is None:
+        summary = {"games": 0, "wins": 0, "guesses": {}, "streak": 0, "max_streak": 0,
+                   "duration_sum": 0.0, "hint_sum": 0, "hint_games": 0, "last_played": timestamp}
+    # Verteilung der Versuche nur über gewonnene Spiele
+    guesses = dict(summary["guesses"])
+    if won:
+        guesses[str(attempts)] = guesses.get(str(attempts), 0) + 1
+    streak = summary["streak"] + 1 if won else 0
+    return {
+        "games": summary["games"] + 1,
+        "wins": summary["wins"] + int(won),
+        "guesses": guesses,
+        "streak": streak,
+        "max_streak": max(summary["max_streak"], streak),
+        "duration_sum": summary["duration_sum"] + duration,
+        "hint_sum": summary["hint_sum"] + hints,
+        "hint_games": summary["hint_games"] + int(hints > 0),
+        "last_played": max(summary["last_played"], timestamp)
+    }
+
+
+def newest_first(game_ids: List[str], offset: int = 0, limit: Optional[int] = None) -> List[str]:
+    """Seite einer in Spielreihenfolge angehängten ID-Liste, neueste zuerst"""
+    end = max(len(game_ids) - offset, 0)
+    start = 0 if limit is None else max(end - limit, 0)
+    return game_ids[start:end][::-1]
+
+
+class JournaledFile:
+    """JSON-Snapshot mit eigenem Append-Only-Journal.
+
+    Jede Änderung wird als kompakte Zeile ans Journal gehängt, nach
+    COMPACT_EVERY Einträgen schreibt der nächste Flush einen neuen Snapshot.
+    """
+
+    def __init__(self, path: str, journal_path: Optional[str] = None):
+        self.path = path
+        self.journal_path = journal_path or f"{path}.journal"
+        self.data: Optional[dict] = None
+        self.journal_seq = 0
+        self.journal_entries = 0
+        self.pending_lines: List[str] = []
+        self.dirty = False
+        self.writing = False
+        self.last_used = time.monotonic()
+
+    def read_snapshot(self) -> Optional[dict]:
+        """None, wenn es noch keinen Snapshot gibt. Ein unlesbarer Snapshot bricht ab,
+        statt beim nächsten Flush durch einen leeren überschrieben zu werden."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{self.path} ist beschädigt und wird nicht überschrieben: {e}") from e
+        self.journal_seq = data.pop("journal_seq", 0)
+        return data
+
+    def first_record(self, op: str) -> Optional[dict]:
+        """Erster lesbarer Journal-Eintrag mit dieser Operation, um das Format des Journals zu erkennen"""
+        try:
+            with open(self.journal_path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record["op"] == op:
+                        return record
+        except FileNotFoundError:
+            pass
+        return None
+
+    def replay(self, apply_record: Callable, data: Optional[dict] = None):
+        """Spielt alle Journal-Einträge ein, die noch nicht im Snapshot stehen"""
+        data = self.data if data is None else data
+        try:
+            with open(self.journal_path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Abgebrochener letzter Schreibvorgang
+                        continue
+                    if record["seq"] <= self.journal_seq:
+                        continue
+                    apply_record(data, record)
+                    self.journal_seq = record["seq"]
+                    self.journal_entries += 1
+        except FileNotFoundError:
+            pass
+
+    def append(self, record: dict):
+        self.journal_seq += 1
+        record["seq"] = self.journal_seq
+        self.pending_lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+        self.journal_entries += 1
+        self.dirty = True
+
+    def request_compaction(self):
+        self.journal_entries = max(self.journal_entries, COMPACT_EVERY)
+        self.dirty = True
+
+    def snapshot(self, copy_data: Callable):
+        self.dirty = False
+        self.writing = True
+        lines, self.pending_lines = self.pending_lines, []
+        data = None
+        if self.journal_entries >= COMPACT_EVERY:
+            data = copy_data(self.data)
+            self.journal_entries = 0
+        return lines, data, self.journal_seq
+
+    def write(self, payload):
+        lines, data, journal_seq = payload
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if data is not None:
+            # Snapshot enthält alle Einträge bis journal_seq, danach Journal leeren
+            write_json_atomic(self.path, {**data, "journal_seq": journal_seq}, separators=(",", ":"))
+            with open(self.journal_path, "w"):
+                pass
+        elif lines:
+            with open(self.journal_path, "a") as f:
+                f.write("".join(lines))
+        # Bei einem Fehler bleibt writing gesetzt, bis restore() die Zeilen zurücklegt
+        self.writing = False
+
+    def restore(self, payload):
+        lines, data, journal_seq = payload
+        self.writing = False
+        # Doppelt geschriebene Zeilen überspringt replay() anhand der Sequenznummer
+        self.pending_lines = lines + self.pending_lines
+        if data is not None:
+            self.request_compaction()
+        self.dirty = True
+
+
+class HistoryStorage(PersistentStore):
+    """Gemeinsame Schnittstelle aller Speicher-Backends der GameHistory.
+
+    Alle Spiellisten werden neueste zuerst zurückgegeben, `offset` zählt ab
+    dem neuesten Spiel. Änderungen werden
+    nur vorgemerkt und vom WriteBehindPersister im Hintergrund geschrieben.
+    """
+
+    @abstractmethod
+    def add_game(self, guild_id: int, user_id: Optional[int], anon_id: Optional[str], game_entry: dict):
+        raise NotImplementedError
+
+    @abstractmethod
+    def attach_analysis(self, game_id: str, analysis: List[dict]):
+        """Hängt die Nachanalyse (ein Eintrag je Versuch) an ein gespeichertes Spiel"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def unlock_achievement(self, user_id: int, achievement_id: str, timestamp: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_achievements(self, user_id: int) -> Dict[str, str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_leaderboard(self, scope: str, guild_id: Optional[int] = None) -> List[dict]:
+        """Liest die laufenden Summen je Spieler, sortiert nach leaderboard_key"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_leaderboard_entry(self, scope: str, guild_id: Optional[int], user_id: int) -> Optional[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_window_leaderboard(self, scope: str, guild_id: Optional[int], since_day: str) -> List[dict]:
+        """Fasst die Tages-Buckets ab `since_day` zusammen, sortiert nach leaderboard_key"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_window_leaderboard_entry(self, scope: str, guild_id: Optional[int], user_id: int,
+                                     since_day: str) -> Optional[dict]:
+        """Eintrag eines Spielers aus seinen Tages-Buckets ab `since_day`"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_user_games(self, user_id: int, scope: str, guild_id: Optional[int] = None,
+                       offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_user_games(self, user_id: int, scope: str, guild_id: Optional[int] = None) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_anonymous_games(self, anon_id: str, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_anonymous_games(self, anon_id: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_summary(self, user_id: Optional[int] = None, anon_id: Optional[str] = None) -> Optional[dict]:
+        """Laufende Zusammenfassung (siehe add_to_summary) eines Spielers oder einer Anonym-ID"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_recent_games(self, guild_id: int, offset: int = 0, limit: Optional[int] = None,
+                         anchor: Optional[str] = None) -> List[tuple]:
+        """Gibt (Typ, Spieler-/Anonym-ID, Spiel) Tupel der letzten RECENT_GAMES_LIMIT Server-Spiele zurück.
+        Mit `anchor` zählt `offset` ab diesem Spiel statt ab dem neuesten, neuere Spiele verschieben nichts."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_recent_games(self, guild_id: int, anchor: Optional[str] = None) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_game_owner(self, game_id: str) -> Optional[Tuple[Optional[int], Optional[str]]]:
+        """Gibt (user_id, anon_id) eines Spiels über den ID-Index zurück, ohne das Spiel zu laden"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_game(self, game_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def has_game(self, game_id: str) -> bool:
+        return self.get_game_owner(game_id) is not None
+
+    def find_game(self, game_id: str, user_id: Optional[int] = None, anon_id: Optional[str] = None) -> Optional[dict]:
+        """Gibt das Spiel nur zurück, wenn es dem Spieler oder der Anonym-ID gehört"""
+        owner = self.get_game_owner(game_id)
+        if owner is None:
+            return None
+        owner_id, owner_anon_id = owner
+        if (user_id is not None and owner_id == user_id) or (anon_id is not None and owner_anon_id == anon_id):
+            return self.get_game(game_id)
+        return None
+
+    @abstractmethod
+    def iter_public_games_since(self, since: str) -> Iterator[tuple]:
+        """Liefert (user_id, Zeitstempel, Gewonnen, Versuche, Tipps) öffentlicher Spiele ab `since`, älteste zuerst"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_game_stats(self) -> Iterator[tuple]:
+        """Liefert (Spiel-ID, guild_id, user_id, Zeitstempel, Gewonnen, Versuche, Tipps, Dauer) für alle Spiele,
+        user_id ist bei anonymen Spielen None. Darf im Executor-Thread laufen."""
+        raise NotImplementedError
@@ -5,6 +5,7 @@ import os
 from dotenv import load_dotenv
 from typing import Dict, Any
 from utils.helpers import hash_password
+from models.persistence import PersistentStore, write_json_atomic
 
 # Worde Variablen. When use one do a # behind the variable and write # - used
 load_dotenv()
@@ -16,56 +17,80 @@ CONFIG_FILE = os.getenv("CONFIG_FILE")
 SETTINGS_FILE = os.getenv("SETTINGS_FILE") # - used
 DAILY_FILE = os.getenv("DAILY_FILE")
 
-class UserSettings:
+class UserSettings(PersistentStore):
+    """Ein Store für den ganzen Prozess - Lesen passiert nur im Speicher"""
+    DEFAULT_SETTINGS = {
+        "stats_public": True,
+        "history_public": True,
+        "anonymous": False,
+        "anon_password": None,
+        "anon_games": []
+    }
+    VALID_KEYS = ["stats_public", "history_public", "anonymous", 
+                  "anon_id", "anon_password", "anon_games"]
+
     def __init__(self):
         self.settings = self.load_settings()
     
     def load_settings(self):
         try:
             with open(SETTINGS_FILE) as f:
-                return json.load(f)
+                settings = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
+        
+        # Fehlende Standardwerte einmalig beim Laden ergänzen
+        for user_settings in settings.values():
+            if self.fill_defaults(user_settings):
+                self.save_settings()
+        return settings
+    
+    def fill_defaults(self, user_settings: dict) -> bool:
+        changed = False
+        for key, value in self.DEFAULT_SETTINGS.items():
+            if key not in user_settings:
+                user_settings[key] = list(value) if isinstance(value, list) else value
+                changed = True
+        if "anon_id" not in user_settings:
+            user_settings["anon_id"] = str(uuid.uuid4())[:8].upper()
+            changed = True
+        return changed
     
     def save_settings(self):
-        with open(SETTINGS_FILE, "w") as f:
-            json.dump(self.settings, f, indent=2)
+        """Markiert die Einstellungen zum Speichern, geschrieben wird im Hintergrund"""
+        self.mark_dirty()
+    
+    def snapshot(self):
+        # Listen werden nur ersetzt, nie verändert - eine flache Kopie pro Spieler reicht
+        return {user_id: dict(values) for user_id, values in self.settings.items()}
+    
+    def write(self, payload):
+        write_json_atomic(SETTINGS_FILE, payload, indent=2)
     
     def get_settings(self, user_id: int) -> dict:
-        default_settings = {
-            "stats_public": True,
-            "history_public": True,
-            "anonymous": False,
-            "anon_id": str(uuid.uuid4())[:8].upper(),
-            "anon_password": None,
-            "anon_games": []
-        }
         user_id_str = str(user_id)
+        user_settings = self.settings.get(user_id_str)
         
-        if user_id_str not in self.settings:
-            self.settings[user_id_str] = default_settings.copy()
-            self.save_settings()
-        else:
-            for key in default_settings:
-                if key not in self.settings[user_id_str]:
-                    if key == "anon_id":
-                        self.settings[user_id_str][key] = str(uuid.uuid4())[:8].upper()
-                    else:
-                        self.settings[user_id_str][key] = default_settings[key]
+        if user_settings is None:
+            # Neuer Spieler: einmalig anlegen, damit die Anonym-ID stabil bleibt
+            user_settings = self.settings[user_id_str] = {}
+            self.fill_defaults(user_settings)
             self.save_settings()
         
-        return self.settings[user_id_str].copy()
+        return user_settings.copy()
     
     def update_settings(self, user_id: int, **kwargs):
         user_id_str = str(user_id)
         self.get_settings(user_id)
+        user_settings = self.settings[user_id_str]
         
         if 'anon_password' in kwargs and kwargs['anon_password']:
             kwargs['anon_password'] = hash_password(kwargs['anon_password'])
         
-        valid_keys = ["stats_public", "history_public", "anonymous", 
-                     "anon_id", "anon_password", "anon_games"]
+        changed = False
         for key, value in kwargs.items():
-            if key in valid_keys and key in self.settings[user_id_str]:
-                self.settings[user_id_str][key] = value
-        self.save_settings()
+            if key in self.VALID_KEYS and user_settings.get(key) != value:
+                user_settings[key] = value
+                changed = True
+        if changed:
+            self.save_settings()
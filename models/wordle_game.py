@@ -3,9 +3,10 @@ import discord
 import os
 from dotenv import load_dotenv
 from datetime import datetime
-from utils.helpers import WORDS
+from utils.word_bank import WordList, get_word_bank
+from models.feedback_matrix import get_feedback_matrix, decode
 from dotenv import load_dotenv
-from typing import List
+from typing import List, Optional
 
 ## Worde Variablen. When use one do a # behind the variable and write # - used
 
@@ -19,9 +20,11 @@ SETTINGS_FILE = os.getenv("SETTINGS_FILE")
 DAILY_FILE = os.getenv("DAILY_FILE")
 
 class WordleGame:
-    def __init__(self, user_id: int):
+    def __init__(self, user_id: int, word_list: Optional[WordList] = None):
         self.user_id = user_id
-        self.secret_word = random.choice(WORDS)
+        # Das Spiel behält seine Liste, auch wenn sie währenddessen neu geladen wird
+        self.word_list = word_list or get_word_bank().get()
+        self.secret_word = self.word_list.choice()
         self.attempts = []
         self.remaining = MAX_ATTEMPTS
         self.hints_used = 0
@@ -33,23 +36,11 @@ class WordleGame:
         return (datetime.now() - self.start_time).total_seconds()
     
     def check_guess(self, guess: str) -> List[str]:
-        secret = list(self.secret_word)
-        result = [""]*5
-        
-        for i in range(5):
-            if guess[i] == secret[i]:
-                result[i] = "🟩"
-                secret[i] = None
-                self.correct_positions[i] = True
-        
+        # Muster aus der vorberechneten Matrix statt Buchstabe für Buchstabe
+        result = decode(get_feedback_matrix(self.word_list).pattern(guess.lower(), self.secret_word))
         for i in range(5):
             if result[i] == "🟩":
-                continue
-            if guess[i] in secret:
-                result[i] = "🟨"
-                secret[secret.index(guess[i])] = None
-            else:
-                result[i] = "⬛"
+                self.correct_positions[i] = True
         
         self.attempts.append((guess.lower(), result.copy()))
         self.remaining -= 1
@@ -66,6 +57,17 @@ class WordleGame:
         self.hints_used += 1
         return True
     
+    def use_solver_hint(self):
+        """Ein Solver-Tipp kostet wie ein Buchstaben-Tipp einen Tipp"""
+        if self.hints_used >= MAX_HINTS:
+            return False
+        self.hints_used += 1
+        return True
+    
+    def refund_solver_hint(self):
+        """Gibt den Tipp zurück, wenn der Solver keinen Vorschlag liefern konnte"""
+        self.hints_used = max(self.hints_used - 1, 0)
+    
     @property
     def hint_display(self):
         return " ".join(c.upper() if c in self.hinted_letters or self.correct_positions[i] else "▢" 
@@ -0,0 +1,49 @@
+import os
+from dotenv import load_dotenv
+from typing import Optional, FrozenSet
+from utils.word_bank import get_word_bank
+
+## Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE")
+DATA_FILE = os.getenv("DATA_FILE")
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+ALLOWED_WORDS_FILE = os.getenv("ALLOWED_WORDS_FILE", "allowed_words.txt") # - used
+
+_allowed_words: Optional[FrozenSet[str]] = None
+
+
+def read_words(path: str) -> set:
+    with open(path, encoding="utf-8") as f:
+        return {w.strip().lower() for w in f if len(w.strip()) == 5}
+
+
+def load_allowed_words() -> Optional[FrozenSet[str]]:
+    """Erlaubte Rateversuche: ALLOWED_WORDS_FILE plus die Wörter aller Wortlisten.
+    Ohne Wörterbuch gibt es keine Prüfung (None), jedes Wort mit 5 Buchstaben zählt."""
+    if not os.path.exists(ALLOWED_WORDS_FILE):
+        print(f"{ALLOWED_WORDS_FILE} nicht gefunden, Rateversuche werden nicht geprüft")
+        return None
+    return frozenset(read_words(ALLOWED_WORDS_FILE) | get_word_bank().all_words())
+
+
+def refresh_allowed_words():
+    """Baut das Wörterbuch neu auf - dauert bei zehntausenden Wörtern spürbar,
+    daher beim Start und nach dem Neuladen der Wortlisten im Executor aufrufen"""
+    global _allowed_words
+    _allowed_words = load_allowed_words()
+
+
+def get_allowed_words() -> Optional[FrozenSet[str]]:
+    """Das geladene Wörterbuch, None solange keins geladen ist"""
+    return _allowed_words
+
+
+def is_allowed(guess: str) -> bool:
+    # Bis das Wörterbuch im Hintergrund geladen ist, wird nicht geprüft
+    words = _allowed_words
+    return words is None or guess.lower() in words
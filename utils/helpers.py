@@ -6,7 +6,7 @@ from dotenv import load_dotenv
 load_dotenv()
 MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
 MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
-WORDS_FILE = os.getenv("WORDS_FILE") # - used
+WORDS_FILE = os.getenv("WORDS_FILE")
 DATA_FILE = os.getenv("DATA_FILE")
 CONFIG_FILE = os.getenv("CONFIG_FILE")
 SETTINGS_FILE = os.getenv("SETTINGS_FILE")
@@ -20,12 +20,3 @@ def hash_password(password: str) -> str:
 
 def verify_password(stored_hash: str, password: str) -> bool:
     return bcrypt.checkpw(password.encode(), stored_hash.encode())
-
-# Words initialization
-WORDS_FILE = os.getenv("WORDS_FILE", "words.txt")
-if not os.path.exists(WORDS_FILE):
-    with open(WORDS_FILE, "w") as f:
-        f.write("\n".join(["apfel", "birne", "banane", "mango", "beere"]))
-
-with open(WORDS_FILE) as f:
-    WORDS = [w.strip().lower() for w in f.readlines() if len(w.strip()) == 5]
\ No newline at end of file
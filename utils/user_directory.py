@@ -0,0 +1,109 @@
+import asyncio
+import time
+import os
+import discord
+from collections import OrderedDict
+from dotenv import load_dotenv
+from typing import Optional, Dict, Iterable
+
+## Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE")
+DATA_FILE = os.getenv("DATA_FILE")
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 3600)) # - used
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 5000)) # - used
+USER_FETCH_CONCURRENCY = int(os.getenv("USER_FETCH_CONCURRENCY", 5)) # - used
+USER_FETCH_TIMEOUT = 2.0
+
+
+def fallback_name(user_id: int) -> str:
+    return f"Spieler {str(user_id)[-4:]}"
+
+
+class UserDirectory:
+    """Gemeinsamer Cache user_id -> discord.User für alle Ansichten.
+
+    Einträge laufen nach USER_CACHE_TTL Sekunden ab, der älteste fliegt bei
+    mehr als USER_CACHE_SIZE Einträgen raus. Fehlende Spieler werden
+    gleichzeitig, aber höchstens USER_FETCH_CONCURRENCY auf einmal geladen.
+    """
+
+    def __init__(self, bot, ttl: float = USER_CACHE_TTL, max_size: int = USER_CACHE_SIZE,
+                 concurrency: int = USER_FETCH_CONCURRENCY):
+        self.bot = bot
+        self.ttl = ttl
+        self.max_size = max_size
+        self.semaphore = asyncio.Semaphore(concurrency)
+        # user_id -> (User oder None für unbekannte Spieler, Ablaufzeit)
+        self.entries: "OrderedDict[int, tuple]" = OrderedDict()
+        # Laufende Abfragen, damit gleichzeitige Ansichten denselben Spieler nur einmal laden
+        self.pending: Dict[int, asyncio.Task] = {}
+
+    def get_cached(self, user_id: int) -> Optional[tuple]:
+        entry = self.entries.get(user_id)
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            del self.entries[user_id]
+            return None
+        self.entries.move_to_end(user_id)
+        return entry
+
+    def put(self, user_id: int, user: Optional[discord.User]):
+        self.entries[user_id] = (user, time.monotonic() + self.ttl)
+        self.entries.move_to_end(user_id)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    async def get_user(self, user_id: int) -> Optional[discord.User]:
+        return (await self.get_users([user_id]))[user_id]
+
+    async def get_users(self, user_ids: Iterable[int]) -> Dict[int, Optional[discord.User]]:
+        users = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            cached = self.get_cached(user_id)
+            if cached is not None:
+                users[user_id] = cached[0]
+            elif (user := self.bot.get_user(user_id)) is not None:
+                self.put(user_id, user)
+                users[user_id] = user
+            else:
+                missing.append(user_id)
+
+        if missing:
+            tasks = []
+            for user_id in missing:
+                if user_id not in self.pending:
+                    self.pending[user_id] = asyncio.create_task(self.fetch(user_id))
+                tasks.append(self.pending[user_id])
+            for user_id, user in zip(missing, await asyncio.gather(*tasks)):
+                users[user_id] = user
+        return users
+
+    async def fetch(self, user_id: int) -> Optional[discord.User]:
+        try:
+            async with self.semaphore:
+                user = await asyncio.wait_for(self.bot.fetch_user(user_id), USER_FETCH_TIMEOUT)
+            self.put(user_id, user)
+            return user
+        except discord.NotFound:
+            # Gelöschte Konten ebenfalls merken, sonst wird jedes Mal neu gefragt
+            self.put(user_id, None)
+            return None
+        except (discord.HTTPException, asyncio.TimeoutError):
+            return None
+        finally:
+            self.pending.pop(user_id, None)
+
+    async def get_names(self, user_ids: Iterable[int]) -> Dict[int, str]:
+        users = await self.get_users(user_ids)
+        return {
+            user_id: user.display_name if user else fallback_name(user_id)
+            for user_id, user in users.items()
+        }
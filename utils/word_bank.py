@@ -0,0 +1,183 @@
+import asyncio
+import glob
+import os
+import random
+import sys
+from dotenv import load_dotenv
+from typing import Optional, List, Dict, Tuple, Callable
+
+## Worde Variablen. When use one do a # behind the variable and write # - used
+load_dotenv()
+MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+WORDS_FILE = os.getenv("WORDS_FILE", "words.txt") # - used
+DATA_FILE = os.getenv("DATA_FILE")
+CONFIG_FILE = os.getenv("CONFIG_FILE")
+SETTINGS_FILE = os.getenv("SETTINGS_FILE")
+DAILY_FILE = os.getenv("DAILY_FILE")
+WORD_LISTS = os.getenv("WORD_LISTS", "words*.txt") # - used
+WORD_RELOAD_INTERVAL = float(os.getenv("WORD_RELOAD_INTERVAL", 30)) # - used
+
+
+def list_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+class WordList:
+    """Eine geladene Wortliste. Wird nie verändert, beim Neuladen ersetzt eine neue
+    Instanz die alte - laufende Spiele behalten ihre Liste samt Muster-Matrix."""
+    __slots__ = ("name", "path", "version", "words", "word_set", "feedback")
+
+    def __init__(self, name: str, path: str, version: Tuple[int, int], words: Tuple[str, ...]):
+        self.name = name
+        self.path = path
+        # (mtime_ns, Größe) der Datei beim Laden
+        self.version = version
+        self.words = words
+        self.word_set = frozenset(words)
+        # FeedbackMatrix dieser Liste, von get_feedback_matrix beim ersten Aufruf gesetzt
+        self.feedback = None
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.word_set
+
+    def choice(self) -> str:
+        return random.choice(self.words)
+
+
+def file_version(path: str) -> Tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_word_list(path: str) -> Optional[WordList]:
+    """Liest eine Liste einmal ein, gleiche Wörter aller Listen teilen sich per intern() einen String"""
+    version = file_version(path)
+    with open(path, encoding="utf-8") as f:
+        words = tuple(dict.fromkeys(sys.intern(w.strip().lower()) for w in f if len(w.strip()) == 5))
+    if not words:
+        return None
+    return WordList(list_name(path), path, version, words)
+
+
+class WordBank:
+    """Alle Wortlisten (WORD_LISTS plus WORDS_FILE), jede Datei genau einmal geladen.
+
+    Ein Hintergrund-Task prüft alle WORD_RELOAD_INTERVAL Sekunden die Dateien
+    und liest nur geänderte neu ein, im Executor-Thread. `preparers` laufen dort
+    für jede neue Liste, bevor sie sichtbar wird (z.B. Muster-Matrix kompilieren),
+    danach wird das Listen-Dict als Ganzes getauscht und `listeners` laufen im Event-Loop.
+    Leere oder unlesbare Dateien behalten die alte Liste.
+    """
+
+    def __init__(self, pattern: str = WORD_LISTS, default_path: str = WORDS_FILE,
+                 interval: float = WORD_RELOAD_INTERVAL):
+        self.pattern = pattern
+        self.default_path = default_path
+        self.default_name = list_name(default_path)
+        self.interval = interval
+        self.preparers: List[Callable[[WordList], None]] = []
+        self.listeners: List[Callable[[List[WordList]], None]] = []
+        self.task = None
+
+        if not os.path.exists(default_path):
+            with open(default_path, "w") as f:
+                f.write("\n".join(["apfel", "birne", "banane", "mango", "beere"]))
+        self.lists: Dict[str, WordList] = {}
+        self.lists = self.scan()
+        if self.default_name not in self.lists:
+            raise ValueError("Keine gültigen Wörter in der Datei!")
+
+    def paths(self) -> Dict[str, str]:
+        paths = {list_name(path): path for path in sorted(glob.glob(self.pattern))}
+        paths[self.default_name] = self.default_path
+        return paths
+
+    def scan(self) -> Dict[str, WordList]:
+        """Neues Listen-Dict, unveränderte Dateien übernehmen ihre bisherige Liste"""
+        lists = {}
+        for name, path in self.paths().items():
+            current = self.lists.get(name)
+            try:
+                if current is not None and current.path == path and current.version == file_version(path):
+                    lists[name] = current
+                    continue
+                word_list = read_word_list(path)
+            except OSError as e:
+                print(f"Wortliste {path} nicht lesbar: {e}")
+                word_list = None
+            if word_list is None:
+                if current is not None:
+                    lists[name] = current
+                continue
+            for prepare in self.preparers:
+                prepare(word_list)
+            lists[name] = word_list
+        return lists
+
+    def swap(self, lists: Dict[str, WordList]) -> List[WordList]:
+        changed = [word_list for name, word_list in lists.items() if self.lists.get(name) is not word_list]
+        removed = self.lists.keys() - lists.keys()
+        if not changed and not removed:
+            return []
+        self.lists = lists
+        for name in removed:
+            print(f"Wortliste {name} entfernt")
+        for word_list in changed:
+            print(f"Wortliste {word_list.name} geladen ({len(word_list)} Wörter)")
+        for listener in self.listeners:
+            listener(changed)
+        return changed
+
+    def prepare(self):
+        """Lässt die preparers über alle aktuellen Listen laufen - der erste Scan im Konstruktor
+        passiert, bevor sie registriert sind. Blockiert, daher im Executor aufrufen."""
+        for word_list in self.lists.values():
+            for prepare in self.preparers:
+                prepare(word_list)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.get_running_loop().create_task(self.run())
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.swap(await loop.run_in_executor(None, self.scan))
+            except Exception as e:
+                print(f"Fehler beim Neuladen der Wortlisten: {e}")
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    # Abfragen
+
+    def get(self, name: Optional[str] = None) -> WordList:
+        """Aktuelle Liste `name`, unbekannte oder entfernte Listen fallen auf WORDS_FILE zurück"""
+        lists = self.lists
+        word_list = lists.get(name)
+        return word_list if word_list is not None else lists[self.default_name]
+
+    def names(self) -> List[str]:
+        return sorted(self.lists)
+
+    def all_words(self) -> set:
+        return set().union(*(word_list.word_set for word_list in self.lists.values()))
+
+
+_word_bank: Optional[WordBank] = None
+
+
+def get_word_bank() -> WordBank:
+    """Gemeinsame WordBank, beim ersten Aufruf geladen"""
+    global _word_bank
+    if _word_bank is None:
+        _word_bank = WordBank()
+    return _word_bank
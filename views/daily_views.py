@@ -3,7 +3,8 @@ import os
 from dotenv import load_dotenv
 from discord.ui import View, Button, Select, Modal, TextInput
 from discord import Interaction, Embed
-from discord.ext import commands
+from datetime import date
+from typing import Optional
 
 ## Worde Variablen non used yet. When use one do a # behind the variable
 load_dotenv()
@@ -15,11 +16,6 @@ CONFIG_FILE = os.getenv("CONFIG_FILE")
 SETTINGS_FILE = os.getenv("SETTINGS_FILE")
 DAILY_FILE = os.getenv("DAILY_FILE")
 
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
-bot = commands.Bot(command_prefix="!", intents=intents)
-
 class DailyChallengeView(View):
     def __init__(self, cog):
         super().__init__(timeout=60)
@@ -43,24 +39,45 @@ class DailyChallengeView(View):
         if interaction.data["custom_id"] == "daily_start":
             await self.cog.daily_command(interaction)
         elif interaction.data["custom_id"] == "daily_leaderboard":
-            await self.cog.daily_leaderboard(interaction)
+            await self.cog.show_daily_leaderboard(interaction)
         return False
-    
-    @bot.tree.command(name="daily_leaderboard", description="Zeigt das Daily-Challenge-Ranking")
-    async def daily_leaderboard(self, interaction: discord.Interaction):
-        leaderboard = self.daily_challenge.get_leaderboard()[:10]
-    
-        embed = discord.Embed(
-        title="🏆 Daily Leaderboard",
+
+
+async def create_daily_leaderboard_embed(cog, user_id: int, day: Optional[date] = None) -> discord.Embed:
+    """Top 10 der heutigen oder einer archivierten Daily Challenge, dazu der eigene Platz und die Serie"""
+    daily = cog.daily_challenge
+    if day is None or day == date.today():
+        leaderboard = daily.get_leaderboard(limit=10)
+        rank, participants = daily.get_rank(user_id), daily.count_participants()
+        title, empty = "🏆 Daily Leaderboard", "📭 Heute hat noch niemand die Daily Challenge gespielt!"
+    else:
+        # Archivierte Tage sind klein genug, um einmal sortiert zu werden
+        results = cog.daily_archive.get_day_results(day)
+        leaderboard = results[:10]
+        rank = next((idx for idx, (user_str, _) in enumerate(results, 1) if user_str == str(user_id)), None)
+        participants = len(results)
+        title, empty = f"🏆 Daily Leaderboard - {day.strftime('%d.%m.%Y')}", "📭 Für diesen Tag gibt es keine Ergebnisse!"
+
+    embed = discord.Embed(
+        title=title,
         color=discord.Color.gold()
-        )
-    
-        for idx, (user_id, data) in enumerate(leaderboard, 1):
-            user = await self.bot.fetch_user(int(user_id))
-            embed.add_field(
-            name=f"{idx}. {user.display_name}",
-            value=f"Versuche: {data['attempts']} | Zeit: {data['timestamp']}",
+    )
+    if day is not None and (archived := cog.daily_archive.get_day(day)):
+        embed.description = f"Wort: ||{archived['word'].upper()}||"
+    if not leaderboard:
+        embed.description = empty
+        return embed
+
+    names = await cog.users.get_names(int(user_str) for user_str, _ in leaderboard)
+    for idx, (user_str, data) in enumerate(leaderboard, 1):
+        result = "✅" if data.get("won", True) else "❌"
+        embed.add_field(
+            name=f"{idx}. {names[int(user_str)]}",
+            value=f"{result} Versuche: {data['attempts']} | Zeit: {data.get('duration', 0.0):.0f}s",
             inline=False
-            )
-    
-        await interaction.response.send_message(embed=embed)
+        )
+
+    current, best = daily.get_streak(user_id)
+    footer = f"Dein Platz: {rank}/{participants}" if rank else f"{participants} Teilnehmer"
+    embed.set_footer(text=f"{footer} · 🔥 Daily-Serie: {current} (Rekord {best})")
+    return embed
@@ -29,7 +29,7 @@ class EndGameView(View):
     
     @ui.button(label="Statistiken", style=discord.ButtonStyle.blurple, emoji="📊", custom_id="end_stats")
     async def show_stats(self, interaction: discord.Interaction, button: Button):
-        user = await self.cog.bot.fetch_user(self.user_id)
+        user = await self.cog.users.get_user(self.user_id) or discord.Object(id=self.user_id)
         await self.cog.show_stats(interaction, user)
 
 class MainMenu(View):
@@ -132,6 +132,13 @@ class GameView(View):
             emoji="💡",
             custom_id="hint_button"
         ))
+        self.add_item(Button(
+            label="Solver 🧠",
+            style=discord.ButtonStyle.secondary,
+            disabled=(not game or game.hints_used >= MAX_HINTS),
+            emoji="🔎",
+            custom_id="solver_button"
+        ))
         self.add_item(Button(
             label="Beenden 🗑️", 
             style=discord.ButtonStyle.danger, 
@@ -151,6 +158,8 @@ class GameView(View):
                 await interaction.response.send_modal(GuessModal(self.cog))
             elif custom_id == "hint_button":
                 await self.cog.handle_give_hint(interaction)
+            elif custom_id == "solver_button":
+                await self.cog.handle_solver_hint(interaction)
             elif custom_id == "quit_button":
                 await self.cog.handle_end_game(interaction, False)
             
@@ -73,6 +73,8 @@ class HistoryView(View):
         self.current_scope = "server"
         self.current_mode = "public"
         self.page = 0
+        # Anzahl Spiele beim Öffnen - neue Spiele verschieben die Seiten nicht
+        self.anchor_total = None
         self.view_id = str(uuid.uuid4())[:8]
 
         # UI-Komponenten
@@ -111,8 +113,7 @@ class HistoryView(View):
         ]
 
     def update_button_states(self):
-        games = self.get_games()
-        total = len(games)
+        total = self.count_games()
         for btn in self.nav_buttons:
             if btn.emoji.name == "⏮️":
                 btn.disabled = self.page <= 0 or total == 0
@@ -125,8 +126,7 @@ class HistoryView(View):
 
     async def handle_navigation(self, interaction: discord.Interaction):
         action = interaction.data["custom_id"].split("_")[0]
-        games = self.get_games()
-        total = len(games)
+        total = self.count_games()
 
         if action == "page":
             modal = PageSelectModal(total)
@@ -145,6 +145,7 @@ class HistoryView(View):
     async def update_scope(self, interaction: discord.Interaction):
         self.current_scope = interaction.data["values"][0]
         self.page = 0
+        self.anchor_total = None
         await self.safe_update(interaction)
 
     async def update_mode(self, interaction: discord.Interaction):
@@ -154,6 +155,7 @@ class HistoryView(View):
                 return
         self.current_mode = new_mode
         self.page = 0
+        self.anchor_total = None
         await self.safe_update(interaction)
 
     async def verify_anonymity(self, interaction: discord.Interaction) -> bool:
@@ -166,25 +168,47 @@ class HistoryView(View):
         await modal.wait()
         return modal.verified
 
-    def get_games(self):
+    def count_games(self):
+        if self.anchor_total is None:
+            self.anchor_total = self.count_live_games()
+        return self.anchor_total
+
+    def count_live_games(self):
         if self.current_mode == "anonymous":
             settings = self.cog.settings.get_settings(self.user_id)
-            return self.cog.history.get_anonymous_games(settings["anon_id"])
-        return self.cog.history.get_user_games(
+            return self.cog.history.count_anonymous_games(settings["anon_id"])
+        return self.cog.history.count_user_games(
             self.user_id,
             self.current_scope,
             self.guild_id if self.current_scope == "server" else None
         )
 
+    def get_game(self, index: int):
+        """Lädt nur das Spiel der aktuellen Seite"""
+        # Seit dem Öffnen hinzugekommene Spiele überspringen
+        index += self.count_live_games() - self.count_games()
+        if self.current_mode == "anonymous":
+            settings = self.cog.settings.get_settings(self.user_id)
+            games = self.cog.history.get_anonymous_games(settings["anon_id"], offset=index, limit=1)
+        else:
+            games = self.cog.history.get_user_games(
+                self.user_id,
+                self.current_scope,
+                self.guild_id if self.current_scope == "server" else None,
+                offset=index,
+                limit=1
+            )
+        return games[0] if games else None
+
     def create_embed(self):
-        games = self.get_games()
-        game = games[self.page] if games else None
+        total = self.count_games()
+        game = self.get_game(self.page) if total else None
         
         embed = discord.Embed(
             title=f"📜 {'Globale' if self.current_scope == 'global' else 'Server'} Historie",
             description=f"Modus: {'🎭 Anonym' if self.current_mode == 'anonymous' else '🌍 Öffentlich'}",
             color=discord.Color.blue()
-        ).set_footer(text=f"Seite {self.page + 1}/{len(games)}")
+        ).set_footer(text=f"Seite {self.page + 1}/{total}")
 
         if game:
             # Server-Info für globale Spiele
@@ -193,11 +217,16 @@ class HistoryView(View):
                 guild = self.cog.bot.get_guild(game["guild_id"])
                 server_info = f"\n🏰 Server: {guild.name if guild else 'Unbekannt'}"
             
-            # Spielverlauf
-            attempts = "\n".join(
-                f"`{g['word'].upper()}`: {' '.join(g['result'])}" 
-                for g in game["guesses"]
-            )
+            # Spielverlauf, mit Nachanalyse sobald sie vorliegt
+            analysis = game.get("analysis") or []
+            lines = []
+            for i, g in enumerate(game["guesses"]):
+                line = f"`{g['word'].upper()}`: {' '.join(g['result'])}"
+                if i < len(analysis):
+                    step = analysis[i]
+                    line += f" → {step['remaining']} übrig (🧠 `{step['best'].upper()}`: {step['optimal']})"
+                lines.append(line)
+            attempts = "\n".join(lines)
             
             embed.add_field(
                 name="🔍 Spiel-Details",
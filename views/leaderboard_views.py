@@ -18,6 +18,13 @@ CONFIG_FILE = os.getenv("CONFIG_FILE")
 SETTINGS_FILE = os.getenv("SETTINGS_FILE")
 DAILY_FILE = os.getenv("DAILY_FILE")
 
+WINDOW_LABELS = {
+    "all": "🏆 Gesamt",
+    "daily": "📅 Heute",
+    "weekly": "🗓️ Letzte 7 Tage",
+    "monthly": "📆 Letzte 30 Tage"
+}
+
 class EnhancedLeaderboardView(View):
     def __init__(self, cog, interaction: discord.Interaction, guild_id: Optional[int], scope: str = "server"):
         super().__init__(timeout=60)
@@ -25,7 +32,8 @@ class EnhancedLeaderboardView(View):
         self.interaction = interaction  # Speichere die Interaktion
         self.guild_id = guild_id
         self.scope = scope
-        self.leaderboard_data = []
+        self.window = "all"
+        self.total_entries = 0
         self.current_page = 0
         self.page_size = 10
         self.view_id = str(uuid.uuid4())[:8]
@@ -33,15 +41,23 @@ class EnhancedLeaderboardView(View):
         self.create_components()
 
     def initialize_data(self):
-        raw_data = self.cog.history.get_leaderboard(self.scope, self.guild_id)
-        self.leaderboard_data = sorted(
-            [entry for entry in raw_data if entry['total'] > 0],
-            key=lambda x: (-x['wins'], -x['total'], x['avg_attempts']),
-            reverse=False
-        )[:100]
+        # Nur die Anzahl, die Seiten kommen einzeln aus der sortierten Bestenliste
+        self.total_entries = self.cog.history.count_leaderboard(self.scope, self.guild_id, self.window)
 
     def create_components(self):
         self.clear_items()
+
+        # Zeitfenster
+        window_select = Select(
+            placeholder="⏱️ Zeitraum wählen",
+            options=[
+                discord.SelectOption(label=label, value=window, default=window == self.window)
+                for window, label in WINDOW_LABELS.items()
+            ],
+            custom_id=f"window_{self.view_id}"
+        )
+        window_select.callback = self.switch_window
+        self.add_item(window_select)
         
         # Scope Buttons
         server_btn = Button(
@@ -63,7 +79,7 @@ class EnhancedLeaderboardView(View):
         self.add_item(global_btn)
 
         # Pagination
-        if len(self.leaderboard_data) > self.page_size:
+        if self.total_entries > self.page_size:
             prev_btn = Button(emoji="⬅️", custom_id=f"prev_page_{self.view_id}")
             prev_btn.callback = self.prev_page
             self.add_item(prev_btn)
@@ -91,30 +107,29 @@ class EnhancedLeaderboardView(View):
         recent_btn.callback = self.show_recent_games
         self.add_item(recent_btn)
 
-    def create_leaderboard_embed(self):
+    async def create_leaderboard_embed(self):
         embed = discord.Embed(
             title=f"🏆 {get_scope_label(self.scope)} Rangliste",
             color=discord.Color.gold()
         )
+        if self.window != "all":
+            embed.title += f" - {WINDOW_LABELS[self.window]}"
         
         start_idx = self.current_page * self.page_size
-        end_idx = start_idx + self.page_size
-        page_data = self.leaderboard_data[start_idx:end_idx]
+        page_data = self.cog.history.get_leaderboard_page(
+            self.scope, self.guild_id, start_idx, self.page_size, self.window
+        )
 
-        # Korrektur: Verwende self.interaction statt self.cog.ctx
-        user_position = next(
-            (i+1 for i, entry in enumerate(self.leaderboard_data) 
-            if entry["user_id"] == self.interaction.user.id  # 👈 Korrigierte Zeile
-        ), None)
+        user_position = self.cog.history.get_leaderboard_rank(
+            self.scope, self.guild_id, self.interaction.user.id, self.window
+        )
 
         if user_position:
             embed.description = f"Deine Position: #{user_position}"
 
+        # Alle Namen der Seite auf einmal, fehlende werden gleichzeitig nachgeladen
+        names = await self.cog.users.get_names(entry['user_id'] for entry in page_data)
         for idx, entry in enumerate(page_data, start=1):
-            user = self.cog.bot.get_user(entry['user_id'])
-            if not user:
-                continue
-                
             stats = [
                 f"🏆 Siege: {entry['wins']}",
                 f"📊 Winrate: {entry['win_rate']*100:.1f}%",
@@ -122,24 +137,30 @@ class EnhancedLeaderboardView(View):
             ]
             
             embed.add_field(
-                name=f"{start_idx + idx}. {user.display_name}",
+                name=f"{start_idx + idx}. {names[entry['user_id']]}",
                 value="\n".join(stats),
                 inline=False
             )
 
-        embed.set_footer(text=f"Seite {self.current_page + 1}/{(len(self.leaderboard_data)-1)//self.page_size + 1}")
+        embed.set_footer(text=f"Seite {self.current_page + 1}/{max(1, (self.total_entries - 1) // self.page_size + 1)}")
         return embed
 
     async def update_view(self, interaction: discord.Interaction):
         self.create_components()
         try:
             await interaction.response.edit_message(
-                embed=self.create_leaderboard_embed(),
+                embed=await self.create_leaderboard_embed(),
                 view=self
             )
         except discord.NotFound:
             await interaction.followup.send("❌ Leaderboard konnte nicht aktualisiert werden!", ephemeral=True)
 
+    async def switch_window(self, interaction: discord.Interaction):
+        self.window = interaction.data["values"][0]
+        self.current_page = 0
+        self.initialize_data()
+        await self.update_view(interaction)
+
     async def switch_scope_server(self, interaction: discord.Interaction):
         self.scope = "server"
         self.guild_id = interaction.guild.id
@@ -159,7 +180,7 @@ class EnhancedLeaderboardView(View):
         await self.update_view(interaction)
 
     async def next_page(self, interaction: discord.Interaction):
-        max_page = (len(self.leaderboard_data) - 1) // self.page_size
+        max_page = max(0, (self.total_entries - 1) // self.page_size)
         self.current_page = min(max_page, self.current_page + 1)
         await self.update_view(interaction)
 
@@ -173,7 +194,7 @@ class EnhancedLeaderboardView(View):
             public_games=[]
         )
         await interaction.response.send_message(
-            embed=view.create_embed(),
+            embed=await view.create_embed(),
             view=view,
             ephemeral=True
         )
@@ -221,7 +242,7 @@ class EnhancedLeaderboardView(View):
         try:
             view = RecentGamesView(self.cog, interaction.guild.id)  # 👈 guild.id statt guild_id
             await interaction.response.send_message(
-                embed=view.create_embed(),
+                embed=await view.create_embed(),
                 view=view,
                 ephemeral=True
             )
@@ -239,8 +260,11 @@ class RecentGamesView(View):
         self.guild_id = guild_id
         self.page = 0
         self.page_size = 5  # Reduzierte Anzahl für bessere Übersicht
-        self.games = self.load_games()
-        self.total_pages = max(1, (len(self.games) - 1) // self.page_size + 1)
+        # Neuestes Spiel beim Öffnen merken, die Seiten zählen ab ihm - neue Spiele verschieben nichts
+        newest = self.cog.history.get_recent_games(self.guild_id, limit=1)
+        self.anchor = newest[0][2]["id"] if newest else None
+        total = self.cog.history.count_recent_games(self.guild_id, self.anchor) if newest else 0
+        self.total_pages = max(1, (total - 1) // self.page_size + 1)
         self.include_anonymous = False  # Neuer Filter
 
         prev_button = Button(emoji="⬅️", style=discord.ButtonStyle.primary)
@@ -252,37 +276,24 @@ class RecentGamesView(View):
         self.add_item(next_button)
 
     def load_games(self):
-        all_games = []
-        guild_data = self.cog.history.data["guilds"].get(str(self.guild_id), {})
-
-        # Öffentliche Spiele
-        for user_id_str, games in guild_data.get("users", {}).items():
-            all_games.extend([
-                ("public", int(user_id_str), game) 
-                for game in games 
-                if not game.get("anonymous", False)
-            ])
-
-        # Anonyme Spiele
-        for anon_id in self.cog.history.data["anonymous_games"]:
-            anon_games = self.cog.history.get_anonymous_games(anon_id)
-            all_games.extend([
-                ("anon", anon_id, game)
-                for game in anon_games
-                if game.get("guild_id") == self.guild_id
-            ])
-
-        return sorted(all_games, key=lambda x: x[2]["timestamp"], reverse=True)[:100]
-
-    def create_embed(self):
+        # Öffentliche und anonyme Spiele der aktuellen Seite, neueste zuerst
+        if self.anchor is None:
+            return []
+        return self.cog.history.get_recent_games(self.guild_id, offset=self.page * self.page_size,
+                                                 limit=self.page_size, anchor=self.anchor)
+
+    async def create_embed(self):
         embed = discord.Embed(title="🕒 Letzte Server-Spiele", color=discord.Color.blue())
         
         start_idx = self.page * self.page_size
-        for idx, (game_type, identifier, game) in enumerate(self.paginated_games(), start=1):
+        page_games = self.paginated_games()
+        names = await self.cog.users.get_names(
+            identifier for game_type, identifier, _ in page_games if game_type == "public"
+        )
+        for idx, (game_type, identifier, game) in enumerate(page_games, start=1):
             global_number = start_idx + idx
             if game_type == "public":
-                user = self.cog.bot.get_user(identifier)
-                name = f"{user.display_name if user else 'Unbekannt'} (ID: {game['id']})"
+                name = f"{names[identifier]} (ID: {game['id']})"
             else:
                 name = f"🎭 Anonym (ID: {game['id']})"
 
@@ -301,9 +312,7 @@ class RecentGamesView(View):
         return embed
 
     def paginated_games(self):
-        start = self.page * self.page_size
-        end = start + self.page_size
-        return self.games[start:end]
+        return self.load_games()
 
     async def prev_page(self, interaction: discord.Interaction):
         self.page = max(0, self.page - 1)
@@ -322,7 +331,7 @@ class RecentGamesView(View):
                 elif child.emoji.name == "➡️":
                     child.disabled = (self.page >= self.total_pages - 1)
         
-        await interaction.response.edit_message(embed=self.create_embed(), view=self)
+        await interaction.response.edit_message(embed=await self.create_embed(), view=self)
 
     def update_button_states(self):
         for child in self.children:
@@ -8,7 +8,7 @@ from datetime import datetime
 ## Worde Variablen non used yet. When use one do a # behind the variable
 load_dotenv()
 MAX_HINTS = int(os.getenv("MAX_HINTS", 0))
-MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0))
+MAX_ATTEMPTS = int(os.getenv("MAX_ATTEMPTS", 0)) # - used
 WORDS_FILE = os.getenv("WORDS_FILE")
 DATA_FILE = os.getenv("DATA_FILE")
 CONFIG_FILE = os.getenv("CONFIG_FILE")
@@ -74,6 +74,90 @@ class StatsView(View):
         
         await interaction.response.edit_message(embed=self.create_embed(), view=self)
 
+def create_game_id_embed(game: dict, player: str = None) -> discord.Embed:
+    embed = discord.Embed(title=f"🔍 Spiel {game['id']}", color=discord.Color.blue())
+    if player:
+        embed.add_field(name="Spieler", value=player)
+    embed.add_field(name="Wort", value=f"||{game['word'].upper()}||")
+    embed.add_field(name="Ergebnis", value="Gewonnen 🏆" if game['won'] else "Verloren 💥")
+    embed.add_field(name="Datum", value=datetime.fromisoformat(game['timestamp']).strftime('%d.%m.%Y %H:%M'))
+    return embed
+
+
+def format_summary(summary: dict) -> str:
+    games, wins = summary["games"], summary["wins"]
+    lines = [
+        f"✅ {wins} Siege",
+        f"❌ {games - wins} Niederlagen",
+        f"📊 {wins / games * 100:.1f}% Winrate",
+        f"🔥 Serie: {summary['streak']} (Rekord {summary['max_streak']})",
+        f"⏱️ Ø {summary['duration_sum'] / games:.0f}s pro Spiel",
+        f"💡 Ø {summary['hint_sum'] / games:.1f} Tipps, in {summary['hint_games']} Spielen",
+    ]
+    if wins:
+        # Verteilung der Versuche über die gewonnenen Spiele
+        most = max(summary["guesses"].values())
+        lines.append("")
+        for attempts in range(1, max(MAX_ATTEMPTS, *map(int, summary["guesses"])) + 1):
+            count = summary["guesses"].get(str(attempts), 0)
+            lines.append(f"`{attempts}` {'🟩' * round(count / most * 8)} {count}")
+    return "\n".join(lines)
+
+
+def create_stats_embed(public_summary: dict = None, anon_summary: dict = None) -> discord.Embed:
+    embed = discord.Embed(title="📊 Statistiken", color=discord.Color.gold())
+    if public_summary:
+        embed.add_field(name="Öffentliche Spiele", value=format_summary(public_summary), inline=True)
+    if anon_summary:
+        embed.add_field(name="🎭 Anonyme Spiele", value=format_summary(anon_summary), inline=True)
+    if not public_summary and not anon_summary:
+        embed.description = "📭 Noch keine Spiele gespielt!"
+    return embed
+
+
+def create_server_stats_embed(guild_name: str, overview: dict, by_hour: dict, by_week: dict) -> discord.Embed:
+    embed = discord.Embed(title=f"📈 Serverstatistik - {guild_name}", color=discord.Color.blue())
+    if not overview["games"]:
+        embed.description = "📭 Auf diesem Server wurde noch nicht gespielt!"
+        return embed
+
+    embed.add_field(
+        name="Überblick",
+        value=f"🎮 {overview['games']} Spiele von {overview['players']} Spielern\n"
+              f"📊 {overview['win_rate'] * 100:.1f}% Winrate\n"
+              f"🔢 Ø {overview['avg_attempts']:.2f} Versuche\n"
+              f"💡 Ø {overview['avg_hints']:.2f} Tipps\n"
+              f"⏱️ Ø {overview['avg_duration']:.0f}s pro Spiel",
+        inline=False
+    )
+
+    # Je vier Stunden zusammengefasst
+    games = by_hour["games"].reshape(6, 4).sum(axis=1)
+    wins = by_hour["won"].reshape(6, 4).sum(axis=1)
+    embed.add_field(
+        name="🕒 Winrate nach Uhrzeit",
+        value="\n".join(
+            f"`{block * 4:02d}-{block * 4 + 4:02d} Uhr` {wins[block] / games[block] * 100:5.1f}% ({games[block]} Spiele)"
+            if games[block] else f"`{block * 4:02d}-{block * 4 + 4:02d} Uhr` -"
+            for block in range(6)
+        ),
+        inline=False
+    )
+
+    lines = []
+    for week in range(len(by_week["games"])):
+        label = "Letzte 7 Tage" if week == 0 else f"Vor {week} Woche{'n' if week > 1 else ''}"
+        count = by_week["games"][week]
+        if count:
+            lines.append(f"**{label}:** {count} Spiele, {by_week['won'][week] / count * 100:.0f}% Siege, "
+                         f"Ø {by_week['attempts'][week] / count:.2f} Versuche, Ø {by_week['hints'][week] / count:.2f} Tipps")
+        else:
+            lines.append(f"**{label}:** keine Spiele")
+    embed.add_field(name="📅 Verlauf", value="\n".join(lines), inline=False)
+    return embed
+
+
+
 class SearchIDModal(Modal, title="🔍 Spiel nach ID suchen"):
     game_id = TextInput(label="Spiel-ID", placeholder="Gib die 8-stellige ID ein", min_length=8, max_length=8)
 
@@ -85,17 +169,13 @@ class SearchIDModal(Modal, title="🔍 Spiel nach ID suchen"):
     async def on_submit(self, interaction: discord.Interaction):
         game = self.find_game(self.game_id.value.upper())
         if game:
-            embed = discord.Embed(title=f"🔍 Spiel {self.game_id.value}", color=discord.Color.blue())
-            embed.add_field(name="Wort", value=f"||{game['word'].upper()}||")
-            embed.add_field(name="Ergebnis", value="Gewonnen 🏆" if game['won'] else "Verloren 💥")
-            embed.add_field(name="Datum", value=datetime.fromisoformat(game['timestamp']).strftime('%d.%m.%Y %H:%M'))
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.response.send_message(embed=create_game_id_embed(game), ephemeral=True)
         else:
             await interaction.response.send_message("❌ Kein Spiel mit dieser ID gefunden!", ephemeral=True)
 
     def find_game(self, game_id: str):
-        games = self.cog.history.data["global"]["users"].get(str(self.user.id), [])
-        anon_games = self.cog.history.get_anonymous_games(
-            self.cog.settings.get_settings(self.user.id)["anon_id"]
+        return self.cog.history.find_game(
+            game_id,
+            user_id=self.user.id,
+            anon_id=self.cog.settings.get_settings(self.user.id)["anon_id"]
         )
-        return next((g for g in games + anon_games if g["id"] == game_id), None)